@@ -7,20 +7,21 @@ through the persistent WS connection and sent back via the REST API.
 from __future__ import annotations
 
 import asyncio
+import functools
+import itertools
 import json
 import logging
-import mimetypes
-import re
+import os
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
+from urllib.parse import parse_qs, quote, urlparse
 
 try:
     import lark_oapi as lark
     from lark_oapi.api.im.v1 import (
         CreateMessageRequest,
         CreateMessageRequestBody,
-        GetImageRequest,
-        GetMessageResourceRequest,
         ReplyMessageRequest,
         ReplyMessageRequestBody,
     )
@@ -37,29 +38,60 @@ from channels.base import (
     InboundMessage,
     OutboundMessage,
 )
+from config import settings
+from core.json_codec import json_loads
 
 logger = logging.getLogger(__name__)
 
-# Regex to strip @bot mentions that Feishu injects in group messages.
-# Feishu formats mentions as @_user_1 or similar placeholders in the text field.
-_AT_BOT_PATTERN = re.compile(r"@_user_\d+\s*")
+# Feishu formats @bot mentions in group messages as @_user_1 or similar
+# placeholders in the text field; _strip_at_bot removes them.
+_AT_BOT_PREFIX = "@_user_"
+_AT_BOT_PREFIX_LEN = len(_AT_BOT_PREFIX)
+
+# Thread pool shared by every Feishu adapter for blocking lark REST calls
+# (downloads, sends).  One pool bounds the total thread count regardless
+# of how many channels are running.
+_FEISHU_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.feishu_max_workers,
+    thread_name_prefix="feishu-io",
+)
+
+# "Message event received" is logged at INFO for 1 in (mask + 1) events
+_EVENT_LOG_SAMPLE_MASK = 0xFF
+
+# Attachment downloads: body read size, and connect/read timeout (seconds)
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+_DOWNLOAD_TIMEOUT = 30
+
+# JSON ``content`` payload of an outbound text message; %s is the encoded text
+_TEXT_CONTENT_TEMPLATE = '{"text": %s}'
 
 
 class FeishuChannelAdapter(ChannelAdapter):
     """Adapter for Feishu/Lark using WebSocket long connection.
 
     Config keys:
-        app_id:     Feishu app ID
-        app_secret: Feishu app secret
+        app_id:      Feishu app ID
+        app_secret:  Feishu app secret
+        ws_threaded: (optional) run the WS client on a dedicated thread
+                     instead of the main event loop
     """
 
+    # Inbound events seen by all Feishu adapters (drives log sampling)
+    _event_counter = itertools.count()
+
     def __init__(self, channel_id: str, config: dict, on_message) -> None:
         super().__init__(channel_id, config, on_message)
         self._app_id: str = config.get("app_id", "")
         self._app_secret: str = config.get("app_secret", "")
         self._ws_client = None
         self._api_client = None
+        self._event_handler = None
         self._ws_thread: Optional[threading.Thread] = None
+        # Set by the WS thread once its event loop has shut down
+        self._ws_done: Optional[threading.Event] = None
+        # Ping task when the WS client runs on the main event loop
+        self._ws_ping_task: Optional[asyncio.Task] = None
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         # Event loop running inside the WS thread (for shutdown signalling)
         self._ws_loop: Optional[asyncio.AbstractEventLoop] = None
@@ -77,13 +109,7 @@ class FeishuChannelAdapter(ChannelAdapter):
             return False, "Missing required config key: app_secret"
 
         try:
-            client = (
-                lark.Client.builder()
-                .app_id(self._app_id)
-                .app_secret(self._app_secret)
-                .log_level(lark.LogLevel.WARNING)
-                .build()
-            )
+            client = _get_api_client(self._app_id, self._app_secret)
             # Attempt to obtain a tenant access token to prove the credentials
             # are valid.  The SDK caches the token internally, so this also
             # warms the cache for the first real request.
@@ -97,16 +123,25 @@ class FeishuChannelAdapter(ChannelAdapter):
                 )
                 .build()
             )
-            response = client.auth.v3.tenant_access_token.internal(request)
+            response = await self._run_blocking(
+                client.auth.v3.tenant_access_token.internal, request
+            )
             if not response.success():
                 return False, f"Feishu credential check failed: {response.msg}"
         except Exception as exc:
             return False, f"Feishu credential check error: {exc}"
 
+        # Reuse the validated client (and its warm connection) in start().
+        self._api_client = client
         return True, None
 
     async def start(self) -> None:
-        """Start the WebSocket long connection in a background thread."""
+        """Start the WebSocket long connection.
+
+        By default the lark WS client runs directly on the current event
+        loop.  If the channel config sets ``ws_threaded``, the client runs
+        in a background thread with its own loop instead.
+        """
         if self._stopped:
             self._stopped = False
 
@@ -115,102 +150,147 @@ class FeishuChannelAdapter(ChannelAdapter):
         self._loop = asyncio.get_running_loop()
 
         # API client used for *sending* messages via REST.
-        self._api_client = (
-            lark.Client.builder()
-            .app_id(self._app_id)
-            .app_secret(self._app_secret)
-            .log_level(lark.LogLevel.WARNING)
-            .build()
-        )
+        if self._api_client is None:
+            self._api_client = _get_api_client(self._app_id, self._app_secret)
+
+        # Build the event handler once (it has no event-loop dependency)
+        # and reuse it across restarts of this adapter.
+        if self._event_handler is None:
+            self._event_handler = (
+                lark.EventDispatcherHandler.builder("", "")
+                .register_p2_im_message_receive_v1(self._handle_message_event)
+                .build()
+            )
 
-        # Build the event handler here (it has no event-loop dependency).
-        self._event_handler = (
-            lark.EventDispatcherHandler.builder("", "")
-            .register_p2_im_message_receive_v1(self._handle_message_event)
-            .build()
+        if self._use_ws_thread():
+            self._ws_done = threading.Event()
+            self._ws_thread = threading.Thread(
+                target=self._run_ws_with_own_loop,
+                args=(self._ws_done,),
+                daemon=True,
+                name=f"feishu-ws-{self.channel_id}",
+            )
+            self._ws_thread.start()
+        else:
+            await self._start_ws_in_loop()
+
+        logger.info(
+            "Feishu adapter started for channel %s (app_id=%s, threaded=%s)",
+            self.channel_id,
+            self._app_id,
+            self._ws_thread is not None,
         )
 
-        def _run_ws_with_own_loop():
-            """Run the lark WS client in a thread with its own event loop.
+    def _use_ws_thread(self) -> bool:
+        """Return True if the WS client must run on a dedicated thread."""
+        return bool(self.config.get("ws_threaded"))
 
-            **Why everything is created here rather than in ``start()``:**
+    async def _start_ws_in_loop(self) -> None:
+        """Run the lark WS client on the current (uvicorn/uvloop) event loop.
 
-            1. The lark SDK uses a *module-level* ``loop`` variable (captured
-               at import time) for all ``run_until_complete`` calls.  Under
-               uvicorn + uvloop that loop is already running → RuntimeError.
-               We patch it with a fresh loop created in this thread.
+        :class:`_FeishuWSClient` schedules its receive loop on the loop it
+        is given instead of lark's module-level one, and fetches the
+        connection URL on the thread pool, so inbound events are dispatched
+        directly on the main loop and connecting never blocks it.
+        """
+        self._ws_client = _FeishuWSClient(
+            self._app_id,
+            self._app_secret,
+            event_handler=self._event_handler,
+            log_level=lark.LogLevel.INFO,
+            loop=self._loop,
+        )
+        # Raises on connection failure, which the gateway reports and retries.
+        await self._ws_client._connect()
+        self._ws_ping_task = asyncio.create_task(self._ws_client._ping_loop())
 
-            2. ``lark.ws.Client.__init__`` creates an ``asyncio.Lock()``
-               which binds to whatever loop is current at construction time.
-               If the Client is created on the main thread but ``start()``
-               runs on the patched loop, the Lock belongs to the wrong loop
-               and async operations (connect, ping, receive) silently fail
-               or timeout.  Creating the Client *inside* this thread solves
-               both problems.
-            """
-            import lark_oapi.ws.client as ws_mod
+    def _run_ws_with_own_loop(self, ws_done: threading.Event) -> None:
+        """Run the lark WS client in a thread with its own event loop.
 
-            new_loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(new_loop)
-            ws_mod.loop = new_loop          # patch the module-level loop
-            # Store reference so stop() can terminate this loop from main thread
-            self._ws_loop = new_loop
+        *ws_done* is this thread's own completion event: it is set on exit
+        even if ``stop()`` has given up waiting or the adapter has since
+        been restarted with a new event.
 
-            try:
-                # Create the WS client HERE so its asyncio.Lock() and any
-                # other async primitives bind to new_loop.
-                self._ws_client = lark.ws.Client(
-                    self._app_id,
-                    self._app_secret,
-                    event_handler=self._event_handler,
-                    log_level=lark.LogLevel.INFO,
+        Used when the channel config sets ``ws_threaded``.
+
+        The loop and the client are both created here: the client is bound
+        to this thread's loop (not lark's module-level one, which under
+        uvicorn is the already running main loop), so threaded and in-loop
+        adapters can run side by side.
+        """
+        new_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(new_loop)
+        # Store reference so stop() can terminate this loop from main thread
+        self._ws_loop = new_loop
+
+        try:
+            self._ws_client = _FeishuWSClient(
+                self._app_id,
+                self._app_secret,
+                event_handler=self._event_handler,
+                log_level=lark.LogLevel.INFO,
+                loop=new_loop,
+            )
+            self._ws_client.start()
+        except Exception as exc:
+            if not self._stopped:
+                logger.exception(
+                    "Feishu WS client crashed for channel %s",
+                    self.channel_id,
                 )
-                self._ws_client.start()
-            except Exception as exc:
-                if not self._stopped:
-                    logger.exception(
-                        "Feishu WS client crashed for channel %s",
-                        self.channel_id,
-                    )
-                    # Report the failure back to the gateway via error callback
-                    error_msg = f"WebSocket connection failed: {exc}"
-                    main_loop = self._loop
-                    if (
-                        self._on_error is not None
-                        and main_loop is not None
-                        and not main_loop.is_closed()
-                    ):
-                        try:
-                            main_loop.call_soon_threadsafe(
-                                asyncio.ensure_future,
-                                self._on_error(self.channel_id, error_msg),
-                            )
-                        except RuntimeError:
-                            pass  # loop already closed
-            finally:
+                # Report the failure back to the gateway via error callback
+                error_msg = f"WebSocket connection failed: {exc}"
+                main_loop = self._loop
+                if (
+                    self._on_error is not None
+                    and main_loop is not None
+                    and not main_loop.is_closed()
+                ):
+                    coro = self._on_error(self.channel_id, error_msg)
+                    try:
+                        fut = asyncio.run_coroutine_threadsafe(coro, main_loop)
+                    except RuntimeError:
+                        coro.close()  # loop already closed
+                    else:
+                        fut.add_done_callback(_log_future_exception)
+        finally:
+            # A restart may already have installed a new thread's loop.
+            if self._ws_loop is new_loop:
                 self._ws_loop = None
-                new_loop.close()
-
-        self._ws_thread = threading.Thread(
-            target=_run_ws_with_own_loop,
-            daemon=True,
-            name=f"feishu-ws-{self.channel_id}",
-        )
-        self._ws_thread.start()
-        logger.info(
-            "Feishu adapter started for channel %s (app_id=%s)",
-            self.channel_id,
-            self._app_id,
-        )
+            _cancel_pending_tasks(new_loop)
+            new_loop.close()
+            ws_done.set()
 
     async def stop(self) -> None:
         """Stop the adapter and release resources.
 
-        Terminates the WebSocket daemon thread by stopping its event loop,
+        For the in-loop client, cancels the ping task and closes the
+        connection with auto-reconnect disabled.  For the threaded fallback,
+        terminates the WebSocket daemon thread by stopping its event loop,
         which causes the blocking ``lark.ws.Client.start()`` call to return.
         """
         self._stopped = True
 
+        ping_task = self._ws_ping_task
+        if ping_task is not None:
+            ping_task.cancel()
+            self._ws_ping_task = None
+
+        ws_client = self._ws_client
+        if ws_client is not None:
+            # Prevent the SDK's receive loop from reconnecting once the
+            # connection is closed underneath it.
+            ws_client._auto_reconnect = False
+        if ws_client is not None and self._ws_thread is None:
+            try:
+                await ws_client._disconnect()
+            except Exception:
+                logger.debug(
+                    "Error closing Feishu WS connection for channel %s",
+                    self.channel_id,
+                    exc_info=True,
+                )
+
         # Stop the WS thread's event loop so the blocking start() returns and
         # the daemon thread exits.  call_soon_threadsafe is the only safe way
         # to signal an event loop from another thread.
@@ -221,11 +301,14 @@ class FeishuChannelAdapter(ChannelAdapter):
             except RuntimeError:
                 pass  # loop already closed
 
-        # Wait briefly for the thread to finish
-        ws_thread = self._ws_thread
-        if ws_thread is not None and ws_thread.is_alive():
-            ws_thread.join(timeout=3.0)
-            if ws_thread.is_alive():
+        # Wait briefly for the thread to finish.  The wait happens on an
+        # executor thread so the event loop keeps running meanwhile.
+        ws_done = self._ws_done
+        if self._ws_thread is not None and ws_done is not None:
+            finished = await asyncio.get_running_loop().run_in_executor(
+                None, ws_done.wait, 3.0
+            )
+            if not finished:
                 logger.warning(
                     "Feishu WS thread for channel %s did not stop within 3s",
                     self.channel_id,
@@ -234,26 +317,39 @@ class FeishuChannelAdapter(ChannelAdapter):
         self._ws_client = None
         self._api_client = None
         self._ws_thread = None
+        self._ws_done = None
         self._ws_loop = None
         self._loop = None
         logger.info("Feishu adapter stopped for channel %s", self.channel_id)
 
     # ------------------------------------------------------------------
-    # Incoming messages (called from WS thread)
+    # Incoming messages (called from the lark WS client)
     # ------------------------------------------------------------------
 
     def _handle_message_event(self, data: "lark.im.v1.P2ImMessageReceiveV1") -> None:
         """Handle an incoming im.message.receive_v1 event.
 
-        This callback runs on the WebSocket thread, NOT on the asyncio event
-        loop, so we bridge into asyncio via ``call_soon_threadsafe``.
+        This callback may run on the WebSocket thread (threaded fallback)
+        rather than the main event loop, so we always bridge into asyncio
+        via ``run_coroutine_threadsafe``.  Attachments are not downloaded
+        here: each attachment dict carries a ``download`` coroutine function
+        that the consumer awaits only if it needs the content.
         """
         # Fast path: if the adapter has been stopped, discard immediately.
         # This prevents log noise from daemon threads that outlive stop().
         if self._stopped:
             return
 
-        logger.info("Feishu message event received for channel %s", self.channel_id)
+        # Sampled: one INFO line per _EVENT_LOG_SAMPLE_MASK + 1 events.
+        event_no = next(self._event_counter)
+        if event_no & _EVENT_LOG_SAMPLE_MASK == 0:
+            logger.info(
+                "Feishu message event received for channel %s (event #%d)",
+                self.channel_id,
+                event_no,
+                extra={"channel_id": self.channel_id, "event_no": event_no},
+            )
+        debug = logger.isEnabledFor(logging.DEBUG)
         try:
             event = data.event
             message = event.message
@@ -261,11 +357,13 @@ class FeishuChannelAdapter(ChannelAdapter):
 
             # Supported message types
             if message_type not in ("text", "image", "file"):
-                logger.debug(
-                    "Ignoring unsupported message type (type=%s, id=%s)",
-                    message_type,
-                    message.message_id,
-                )
+                if debug:
+                    logger.debug(
+                        "Ignoring unsupported message type (type=%s, id=%s)",
+                        message_type,
+                        message.message_id,
+                        extra={"channel_id": self.channel_id},
+                    )
                 return
 
             chat_id: str = message.chat_id
@@ -275,8 +373,8 @@ class FeishuChannelAdapter(ChannelAdapter):
 
             # The content field is a JSON string, e.g. '{"text":"hello"}'.
             try:
-                content_obj = json.loads(message.content)
-            except (json.JSONDecodeError, TypeError):
+                content_obj = json_loads(message.content)
+            except (ValueError, TypeError):
                 logger.warning(
                     "Failed to parse message content for message_id=%s",
                     message_id,
@@ -290,29 +388,42 @@ class FeishuChannelAdapter(ChannelAdapter):
                 text = content_obj.get("text", "")
                 # In group chats, strip @bot mention placeholders so the agent
                 # only sees the actual user text.
+                # Most messages carry no placeholder, so skip the scan then.
                 if chat_type == "group":
-                    text = _AT_BOT_PATTERN.sub("", text).strip()
+                    if _AT_BOT_PREFIX in text:
+                        text = _strip_at_bot(text)
+                    text = text.strip()
 
             elif message_type == "image":
                 image_key = content_obj.get("image_key", "")
                 if image_key:
-                    attachment = self._download_image(image_key)
-                    if attachment:
-                        attachments.append(attachment)
+                    attachments.append(self._lazy_attachment(
+                        ATTACH_TYPE_IMAGE,
+                        f"{image_key}.png",
+                        image_key,
+                        self._download_image,
+                        image_key,
+                    ))
 
             elif message_type == "file":
                 file_key = content_obj.get("file_key", "")
                 file_name = content_obj.get("file_name", "attachment")
                 if file_key:
-                    attachment = self._download_file(message_id, file_key, file_name)
-                    if attachment:
-                        attachments.append(attachment)
+                    attachments.append(self._lazy_attachment(
+                        ATTACH_TYPE_FILE,
+                        file_name,
+                        file_key,
+                        self._download_file,
+                        message_id, file_key, file_name,
+                    ))
 
             if not text and not attachments:
-                logger.debug(
-                    "No text or attachments after processing, skipping message_id=%s",
-                    message_id,
-                )
+                if debug:
+                    logger.debug(
+                        "No text or attachments after processing, skipping message_id=%s",
+                        message_id,
+                        extra={"channel_id": self.channel_id},
+                    )
                 return
 
             msg = InboundMessage(
@@ -330,12 +441,18 @@ class FeishuChannelAdapter(ChannelAdapter):
 
             # Bridge from sync WS thread into the asyncio event loop.
             main_loop = self._loop
+            submitted = False
             if main_loop is not None and not main_loop.is_closed() and not self._stopped:
-                main_loop.call_soon_threadsafe(
-                    asyncio.ensure_future,
-                    self._on_message(msg),
-                )
-            else:
+                coro = self._deliver_message(msg)
+                try:
+                    fut = asyncio.run_coroutine_threadsafe(coro, main_loop)
+                except RuntimeError:
+                    # The loop closed between the check and the submit.
+                    coro.close()
+                else:
+                    fut.add_done_callback(_log_future_exception)
+                    submitted = True
+            if not submitted:
                 logger.warning(
                     "Event loop unavailable; dropping inbound message %s "
                     "(loop=%s, stopped=%s)",
@@ -347,10 +464,79 @@ class FeishuChannelAdapter(ChannelAdapter):
         except Exception:
             logger.exception("Error handling Feishu message event")
 
+    async def _deliver_message(self, msg: InboundMessage) -> None:
+        """Hand *msg* to the gateway.
+
+        Runs on the main event loop.
+        """
+        if self._stopped:
+            return
+        await self._on_message(msg)
+
+    def _lazy_attachment(
+        self, attach_type: str, file_name: str, file_key: str, fetch, *args
+    ) -> dict:
+        """Build an attachment dict whose content is downloaded on demand.
+
+        ``await attachment["download"]()`` runs *fetch(*args)* on the shared
+        thread pool (once), merges the resulting ``file_bytes`` / ``file_size``
+        / ``mime_type`` into the dict, and returns whether the download
+        succeeded.
+        """
+        attachment = {
+            "type": attach_type,
+            "file_name": file_name,
+            "mime_type": _guess_mime_type(file_name),
+            "file_key": file_key,
+        }
+        downloaded: Optional[asyncio.Future] = None
+
+        async def download() -> bool:
+            nonlocal downloaded
+            if downloaded is None:
+                downloaded = asyncio.ensure_future(self._run_blocking(fetch, *args))
+            result = await downloaded
+            if result:
+                attachment.update(result)
+                return True
+            return False
+
+        attachment["download"] = download
+        return attachment
+
+    async def _run_blocking(self, fn, *args):
+        """Run a blocking lark SDK call on the shared Feishu thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _FEISHU_EXECUTOR, functools.partial(fn, *args)
+        )
+
     # ------------------------------------------------------------------
-    # File / image download helpers (run on WS thread, sync SDK calls)
+    # File / image download helpers (run on thread pool, blocking calls)
     # ------------------------------------------------------------------
 
+    def _open_resource(self, path: str, params: Optional[dict] = None):
+        """Start a streamed GET of a Feishu API resource.
+
+        lark's ``image.get`` / ``message_resource.get`` buffer the whole
+        body before returning, which defeats a size cap; this issues the
+        same authenticated request with ``stream=True`` so the caller reads
+        the body itself.  Returns a ``requests.Response`` to be used as a
+        context manager.
+        """
+        import requests
+        from lark_oapi.core.token import TokenManager
+
+        config = self._api_client._config
+        token = TokenManager.get_self_tenant_token(config)
+        return requests.get(
+            f"{config.domain}{path}",
+            params=params,
+            headers={"Authorization": f"Bearer {token}"},
+            stream=True,
+            timeout=_DOWNLOAD_TIMEOUT,
+        )
+
     def _download_image(self, image_key: str) -> Optional[dict]:
         """Download an image from Feishu by its image_key.
 
@@ -361,35 +547,34 @@ class FeishuChannelAdapter(ChannelAdapter):
             return None
 
         try:
-            request = (
-                GetImageRequest.builder()
-                .image_key(image_key)
-                .build()
-            )
-            response = self._api_client.im.v1.image.get(request)
-            if not response.success():
-                logger.warning(
-                    "Failed to download image %s: code=%s msg=%s",
-                    image_key, response.code, response.msg,
-                )
-                return None
-
-            file_bytes: bytes = response.file.read()
-            if len(file_bytes) > MAX_ATTACHMENT_SIZE:
+            with self._open_resource(
+                f"/open-apis/im/v1/images/{quote(image_key, safe='')}"
+            ) as response:
+                if not response.ok:
+                    logger.warning(
+                        "Failed to download image %s: status=%s body=%s",
+                        image_key, response.status_code, response.text[:200],
+                    )
+                    return None
+                file_bytes = _read_capped(response)
+            if file_bytes is None:
                 logger.warning(
                     "Image %s exceeds size limit (%d bytes), skipping",
-                    image_key, len(file_bytes),
+                    image_key, MAX_ATTACHMENT_SIZE,
                 )
                 return None
+            file_size = len(file_bytes)
 
-            file_name = f"{image_key}.png"
-            mime_type = _guess_image_mime(file_name, file_bytes)
+            # Feishu image keys carry no extension: name the file after
+            # the format its bytes actually have.
+            mime_type = _guess_image_mime(file_bytes)
+            file_name = f"{image_key}{_IMAGE_EXT.get(mime_type, '.png')}"
 
             return {
                 "type": ATTACH_TYPE_IMAGE,
                 "file_bytes": file_bytes,
                 "file_name": file_name,
-                "file_size": len(file_bytes),
+                "file_size": file_size,
                 "mime_type": mime_type,
                 "file_key": image_key,
             }
@@ -407,28 +592,25 @@ class FeishuChannelAdapter(ChannelAdapter):
             return None
 
         try:
-            request = (
-                GetMessageResourceRequest.builder()
-                .message_id(message_id)
-                .file_key(file_key)
-                .type("file")
-                .build()
-            )
-            response = self._api_client.im.v1.message_resource.get(request)
-            if not response.success():
-                logger.warning(
-                    "Failed to download file %s (key=%s): code=%s msg=%s",
-                    file_name, file_key, response.code, response.msg,
-                )
-                return None
-
-            file_bytes: bytes = response.file.read()
-            if len(file_bytes) > MAX_ATTACHMENT_SIZE:
+            with self._open_resource(
+                f"/open-apis/im/v1/messages/{quote(message_id, safe='')}"
+                f"/resources/{quote(file_key, safe='')}",
+                {"type": "file"},
+            ) as response:
+                if not response.ok:
+                    logger.warning(
+                        "Failed to download file %s (key=%s): status=%s body=%s",
+                        file_name, file_key, response.status_code, response.text[:200],
+                    )
+                    return None
+                file_bytes = _read_capped(response)
+            if file_bytes is None:
                 logger.warning(
                     "File %s exceeds size limit (%d bytes), skipping",
-                    file_name, len(file_bytes),
+                    file_name, MAX_ATTACHMENT_SIZE,
                 )
                 return None
+            file_size = len(file_bytes)
 
             mime_type = _guess_mime_type(file_name)
 
@@ -436,7 +618,7 @@ class FeishuChannelAdapter(ChannelAdapter):
                 "type": ATTACH_TYPE_FILE,
                 "file_bytes": file_bytes,
                 "file_name": file_name,
-                "file_size": len(file_bytes),
+                "file_size": file_size,
                 "mime_type": mime_type,
                 "file_key": file_key,
             }
@@ -454,7 +636,8 @@ class FeishuChannelAdapter(ChannelAdapter):
             logger.error("Cannot send message: Feishu API client not initialised")
             return None
 
-        content = json.dumps({"text": message.text})
+        # Only the text needs JSON-escaping; skip building a dict per send.
+        content = _TEXT_CONTENT_TEMPLATE % json.dumps(message.text)
 
         try:
             if message.reply_to_message_id:
@@ -470,7 +653,9 @@ class FeishuChannelAdapter(ChannelAdapter):
                     )
                     .build()
                 )
-                response = self._api_client.im.v1.message.reply(request)
+                response = await self._run_blocking(
+                    self._api_client.im.v1.message.reply, request
+                )
             else:
                 # Send a new message to the chat.
                 request = (
@@ -485,7 +670,9 @@ class FeishuChannelAdapter(ChannelAdapter):
                     )
                     .build()
                 )
-                response = self._api_client.im.v1.message.create(request)
+                response = await self._run_blocking(
+                    self._api_client.im.v1.message.create, request
+                )
 
             if not response.success():
                 logger.error(
@@ -512,36 +699,279 @@ class FeishuChannelAdapter(ChannelAdapter):
         return "feishu"
 
 
+# ------------------------------------------------------------------
+# Text helpers
+# ------------------------------------------------------------------
+
+_ASCII_DIGITS = frozenset("0123456789")
+_ASCII_SPACE = frozenset(" \t\n\r\f\v")
+
+
+def _strip_at_bot(text: str) -> str:
+    """Remove ``@_user_<digits>`` placeholders and the whitespace after them.
+
+    Equivalent to ``re.sub(r"@_user_\\d+\\s*", "", text, flags=re.ASCII)``
+    but implemented with ``str.find`` so the common case avoids the regex
+    engine and ``re.Match`` allocations.
+    """
+    prefix_len = _AT_BOT_PREFIX_LEN
+    n = len(text)
+    parts: list[str] = []
+    keep_from = 0
+    i = text.find(_AT_BOT_PREFIX)
+    while i != -1:
+        j = i + prefix_len
+        digits_start = j
+        while j < n and text[j] in _ASCII_DIGITS:
+            j += 1
+        if j == digits_start:
+            # Prefix without digits is not a placeholder; keep it.
+            i = text.find(_AT_BOT_PREFIX, i + 1)
+            continue
+        while j < n and text[j] in _ASCII_SPACE:
+            j += 1
+        parts.append(text[keep_from:i])
+        keep_from = j
+        i = text.find(_AT_BOT_PREFIX, j)
+    if not parts:
+        return text
+    parts.append(text[keep_from:])
+    return "".join(parts)
+
+
+# ------------------------------------------------------------------
+# Shared REST clients
+# ------------------------------------------------------------------
+
+# Cached lark REST clients kept per (app_id, app_secret); bounded so that
+# rotated credentials do not leave clients behind forever.
+_API_CLIENT_CACHE_SIZE = 16
+
+
+@functools.lru_cache(maxsize=_API_CLIENT_CACHE_SIZE)
+def _get_api_client(app_id: str, app_secret: str) -> "lark.Client":
+    """Return the cached lark REST client for an app, building it on first use.
+
+    Channels (and restarts) using the same app share one client instead of
+    building one per start.
+    """
+    return (
+        lark.Client.builder()
+        .app_id(app_id)
+        .app_secret(app_secret)
+        .log_level(lark.LogLevel.WARNING)
+        .build()
+    )
+
+
+# ------------------------------------------------------------------
+# WebSocket client
+# ------------------------------------------------------------------
+
+if LARK_AVAILABLE:
+    import lark_oapi.ws.client as _lark_ws
+
+    class _FeishuWSClient(lark.ws.Client):
+        """lark WS client bound to an explicit event loop.
+
+        The SDK schedules its connect and receive coroutines on a
+        *module-level* ``loop`` shared by every client in the process, and
+        its async ``_connect`` fetches the connection URL with a blocking
+        ``requests.post`` (no timeout).  This subclass overrides the methods
+        that do either: each client runs on the loop it was given, and the
+        URL is fetched on the Feishu thread pool so a slow endpoint never
+        stalls that loop.  The bodies otherwise follow the SDK's.
+
+        These overrides mirror private SDK code, so lark-oapi is pinned to
+        an exact version; ``tests/test_feishu_ws.py`` fails when the SDK
+        methods they mirror change.
+        """
+
+        def __init__(self, *args, loop: asyncio.AbstractEventLoop, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            self._loop = loop
+
+        def start(self) -> None:
+            """Connect, then serve on ``self._loop`` until it is stopped.
+
+            Blocking; used by the threaded mode, whose thread owns the loop.
+            """
+            loop = self._loop
+            try:
+                loop.run_until_complete(self._connect())
+            except _lark_ws.ClientException:
+                raise
+            except Exception:
+                loop.run_until_complete(self._disconnect())
+                if not self._auto_reconnect:
+                    raise
+                loop.run_until_complete(self._reconnect())
+            loop.create_task(self._ping_loop())
+            loop.run_forever()
+
+        async def _connect(self) -> None:
+            if self._conn is not None:
+                return
+            conn_url = await self._loop.run_in_executor(
+                _FEISHU_EXECUTOR, self._get_conn_url
+            )
+            async with self._lock:
+                if self._conn is not None:
+                    return
+                query = parse_qs(urlparse(conn_url).query)
+                try:
+                    conn = await _lark_ws.websockets.connect(
+                        conn_url, **_lark_ws._ws_connect_kwargs()
+                    )
+                except _lark_ws.InvalidHandshake as exc:
+                    _lark_ws._parse_ws_conn_exception(exc)  # always raises
+                    raise
+                self._conn = conn
+                self._conn_url = conn_url
+                self._conn_id = query[_lark_ws.DEVICE_ID][0]
+                self._service_id = query[_lark_ws.SERVICE_ID][0]
+            logger.info("Feishu WS connected (app_id=%s)", self._app_id)
+            self._loop.create_task(self._receive_message_loop())
+
+        async def _receive_message_loop(self) -> None:
+            try:
+                while True:
+                    if self._conn is None:
+                        raise _lark_ws.ConnectionClosedException("connection is closed")
+                    msg = await self._conn.recv()
+                    self._loop.create_task(self._handle_message(msg))
+            except Exception as exc:
+                logger.warning(
+                    "Feishu WS receive loop exited (app_id=%s): %s", self._app_id, exc
+                )
+                await self._disconnect()
+                if not self._auto_reconnect:
+                    raise
+                await self._reconnect()
+
+
+def _cancel_pending_tasks(loop: asyncio.AbstractEventLoop) -> None:
+    """Cancel and reap the tasks left on a stopped WS thread loop."""
+    tasks = asyncio.all_tasks(loop)
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+
+
+def _read_capped(response) -> Optional[bytes]:
+    """Read a streamed download, or return None once it exceeds the limit.
+
+    A declared ``Content-Length`` over ``MAX_ATTACHMENT_SIZE`` is rejected
+    before any of the body is read; otherwise reading stops at the first
+    chunk past the limit.
+    """
+    declared = response.headers.get("Content-Length")
+    if declared and declared.isdigit() and int(declared) > MAX_ATTACHMENT_SIZE:
+        return None
+    body = bytearray()
+    for chunk in response.iter_content(_DOWNLOAD_CHUNK_SIZE):
+        body += chunk
+        if len(body) > MAX_ATTACHMENT_SIZE:
+            return None
+    return bytes(body)
+
+
+def _log_future_exception(fut) -> None:
+    """Done-callback that logs errors from coroutines submitted cross-thread."""
+    if fut.cancelled():
+        return
+    exc = fut.exception()
+    if exc is not None:
+        logger.error(
+            "Feishu adapter callback failed", exc_info=(type(exc), exc, exc.__traceback__)
+        )
+
+
 # ------------------------------------------------------------------
 # MIME type helpers
 # ------------------------------------------------------------------
 
 # Magic bytes for common image formats
-_IMAGE_MAGIC = [
-    (b"\x89PNG\r\n\x1a\n", "image/png"),
-    (b"\xff\xd8\xff", "image/jpeg"),
-    (b"GIF87a", "image/gif"),
-    (b"GIF89a", "image/gif"),
-    (b"RIFF", "image/webp"),  # WebP starts with RIFF....WEBP
-    (b"BM", "image/bmp"),
-]
-
-
-def _guess_image_mime(file_name: str, file_bytes: bytes) -> str:
-    """Guess the MIME type of an image, falling back to magic bytes."""
-    mime, _ = mimetypes.guess_type(file_name)
+_IMAGE_MAGIC = {
+    b"\x89PNG\r\n\x1a\n": "image/png",
+    b"\xff\xd8\xff": "image/jpeg",
+    b"GIF87a": "image/gif",
+    b"GIF89a": "image/gif",
+    b"RIFF": "image/webp",  # WebP starts with RIFF....WEBP
+    b"BM": "image/bmp",
+}
+# Distinct prefix lengths, longest first, so the header is probed with
+# one dict lookup per length instead of one slice per signature.
+_IMAGE_MAGIC_LENGTHS = sorted({len(m) for m in _IMAGE_MAGIC}, reverse=True)
+_IMAGE_MAGIC_MAX_LEN = _IMAGE_MAGIC_LENGTHS[0]
+# File extension for each sniffed image type
+_IMAGE_EXT = {
+    "image/png": ".png",
+    "image/jpeg": ".jpg",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+    "image/bmp": ".bmp",
+}
+
+
+# Extension -> MIME type for the attachment types Feishu users commonly send.
+# A static table avoids loading the system mimetypes database.
+_EXT_MIME = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+    ".bmp": "image/bmp",
+    ".svg": "image/svg+xml",
+    ".pdf": "application/pdf",
+    ".doc": "application/msword",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".xls": "application/vnd.ms-excel",
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".ppt": "application/vnd.ms-powerpoint",
+    ".pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    ".txt": "text/plain",
+    ".md": "text/markdown",
+    ".csv": "text/csv",
+    ".html": "text/html",
+    ".htm": "text/html",
+    ".json": "application/json",
+    ".xml": "application/xml",
+    ".zip": "application/zip",
+    ".rar": "application/vnd.rar",
+    ".7z": "application/x-7z-compressed",
+    ".tar": "application/x-tar",
+    ".gz": "application/gzip",
+    ".mp3": "audio/mpeg",
+    ".wav": "audio/wav",
+    ".mp4": "video/mp4",
+    ".mov": "video/quicktime",
+}
+
+
+def _ext_mime(file_name: str) -> Optional[str]:
+    """Look up the MIME type for *file_name*'s extension, if known."""
+    return _EXT_MIME.get(os.path.splitext(file_name)[1].lower())
+
+
+def _guess_image_mime(file_bytes: bytes, file_name: str = "") -> str:
+    """Guess the MIME type of an image from its magic bytes, then its name."""
+    head = bytes(memoryview(file_bytes)[:_IMAGE_MAGIC_MAX_LEN])
+    for length in _IMAGE_MAGIC_LENGTHS:
+        mime_type = _IMAGE_MAGIC.get(head[:length])
+        if mime_type:
+            return mime_type
+    mime = _ext_mime(file_name)
     if mime and mime.startswith("image/"):
         return mime
-    for magic, mime_type in _IMAGE_MAGIC:
-        if file_bytes[:len(magic)] == magic:
-            return mime_type
     return "image/png"
 
 
 def _guess_mime_type(file_name: str) -> str:
     """Guess the MIME type of a file by name."""
-    mime, _ = mimetypes.guess_type(file_name)
-    return mime or "application/octet-stream"
+    return _ext_mime(file_name) or "application/octet-stream"
 
 
 # ------------------------------------------------------------------
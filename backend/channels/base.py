@@ -12,10 +12,19 @@ ATTACH_TYPE_FILE = "file"
 # Max single attachment size (20 MB)
 MAX_ATTACHMENT_SIZE = 20 * 1024 * 1024
 
+# Attachment dicts carry ``type``, ``file_name``, ``file_size`` and
+# ``mime_type``, plus the content as ``file_bytes``.  Adapters may instead
+# provide a ``download`` coroutine function; awaiting it fetches the content
+# and fills in ``file_bytes``.
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class InboundMessage:
-    """Normalized message from an external channel into owork."""
+    """Normalized message from an external channel into owork.
+
+    Instances are immutable; ``attachments`` and ``metadata`` are still
+    mutable containers so adapters can fill them in after construction.
+    """
     channel_id: str
     external_chat_id: str
     external_sender_id: str
@@ -27,7 +36,7 @@ class InboundMessage:
     metadata: dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OutboundMessage:
     """Message from owork to be sent to an external channel."""
     channel_id: str
@@ -12,17 +12,19 @@ This is a singleton that runs within the FastAPI process.  It is responsible for
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
-import re as _re
+import os
 import time
-from collections import defaultdict
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 from uuid import uuid4
 
 from channels.base import ChannelAdapter, InboundMessage, OutboundMessage
-from channels.registry import get_adapter_class, load_adapters
+from channels.registry import get_adapter_class
 from core.agent_manager import agent_manager
 from core.session_manager import session_manager
 from core.workspace_manager import workspace_manager
@@ -35,34 +37,84 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 class _TokenBucketRateLimiter:
-    """Very lightweight per-sender rate limiter backed by a sliding-window
-    list of timestamps.  Not intended for high-throughput production use --
-    good enough for a desktop application with a handful of channels.
+    """Very lightweight per-sender token-bucket rate limiter.
+
+    Each sender's bucket holds up to ``max_per_minute`` tokens and refills
+    continuously at ``max_per_minute / 60`` tokens per second; a message
+    consumes one token.  State is a ``(tokens, last_refill)`` pair per
+    sender, so every check is O(1).  Not intended for high-throughput
+    production use -- good enough for a desktop application with a
+    handful of channels.
+
+    Buckets are kept in least-recently-used order and capped at
+    *max_senders*.  A bucket untouched for 60 s has fully refilled and is
+    indistinguishable from a new one, so such entries are dropped from the
+    LRU end as they age out.
     """
 
-    def __init__(self):
-        # sender_id -> list of Unix timestamps (most recent last)
-        self._windows: dict[str, list[float]] = defaultdict(list)
+    _MAX_SENDERS = 10_000
+    _IDLE_SECONDS = 60.0
+
+    def __init__(self, max_senders: int = _MAX_SENDERS):
+        # sender_id -> (available tokens, monotonic time of last refill),
+        # least recently used first
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._max_senders = max_senders
 
     def is_allowed(self, sender_id: str, max_per_minute: int) -> bool:
         """Return True if *sender_id* is within the rate limit."""
         if max_per_minute <= 0:
             return True
-        now = time.time()
-        window = self._windows[sender_id]
-        # Evict entries older than 60 s
-        cutoff = now - 60.0
-        window[:] = [ts for ts in window if ts > cutoff]
-        if len(window) >= max_per_minute:
-            return False
-        window.append(now)
-        return True
+        now = time.monotonic()
+        buckets = self._buckets
+        self._evict_idle(now)
+
+        state = buckets.get(sender_id)
+        if state is None:
+            if len(buckets) >= self._max_senders:
+                buckets.popitem(last=False)
+            tokens, last = float(max_per_minute), now
+        else:
+            tokens, last = state
+            buckets.move_to_end(sender_id)
+
+        tokens = min(max_per_minute, tokens + (now - last) * (max_per_minute / 60.0))
+        if tokens >= 1.0:
+            buckets[sender_id] = (tokens - 1.0, now)
+            return True
+        buckets[sender_id] = (tokens, now)
+        return False
+
+    def _evict_idle(self, now: float) -> None:
+        """Drop buckets (oldest first) that have been idle long enough to be full."""
+        buckets = self._buckets
+        cutoff = now - self._IDLE_SECONDS
+        while buckets:
+            oldest = next(iter(buckets))
+            if buckets[oldest][1] > cutoff:
+                break
+            del buckets[oldest]
 
     def clear(self, sender_id: Optional[str] = None) -> None:
         if sender_id:
-            self._windows.pop(sender_id, None)
+            self._buckets.pop(sender_id, None)
         else:
-            self._windows.clear()
+            self._buckets.clear()
+
+
+@dataclass(slots=True)
+class _ConversationState:
+    """Mutable per-message state threaded through the agent event handlers."""
+
+    channel_id: str
+    channel_session_id: str
+    session_id: str
+    # Content blocks of the last assistant message that carried text;
+    # flattened into the reply once, after the conversation ends.
+    last_text_blocks: list = field(default_factory=list)
+    # Used only if no assistant text arrives
+    fallback_text: str = ""
+    error_occurred: bool = False
 
 
 # ---------------------------------------------------------------------------
@@ -78,6 +130,9 @@ class ChannelGateway:
     _RETRY_BACKOFF_FACTOR = 2.0
     _RETRY_MAX_ATTEMPTS = 20      # ~1.5 hours at max backoff
 
+    # At most one "sending too quickly" notice per sender per interval
+    _RATE_NOTICE_INTERVAL = 60.0  # seconds
+
     def __init__(self) -> None:
         # channel_id -> running ChannelAdapter instance
         self._adapters: dict[str, ChannelAdapter] = {}
@@ -87,8 +142,13 @@ class ChannelGateway:
         self._retry_tasks: dict[str, asyncio.Task] = {}
         # Per-sender rate limiter (shared across all channels)
         self._rate_limiter = _TokenBucketRateLimiter()
+        # sender_id -> monotonic time of the last rate-limit notice, oldest first
+        self._rate_notice_sent: OrderedDict[str, float] = OrderedDict()
         # In-memory cache of channel configs keyed by channel_id
         self._channel_cache: dict[str, dict] = {}
+        # Strong references to every adapter / retry task until it finishes;
+        # the dicts above drop entries while the task may still be running.
+        self._background: set[asyncio.Task] = set()
         # Flag to prevent retries during shutdown
         self._shutting_down = False
 
@@ -99,32 +159,40 @@ class ChannelGateway:
     async def startup(self) -> None:
         """Called once during FastAPI lifespan startup.
 
-        Loads adapter modules via the registry, then auto-starts every
-        channel found in the database (regardless of previous status).
-        Channels that fail to start will be retried automatically.
+        Auto-starts every channel found in the database (regardless of
+        previous status).  Adapter modules are imported by the registry on
+        first use of their channel type.  Channels that fail to start will
+        be retried automatically.
         """
         logger.info("ChannelGateway starting up")
         self._shutting_down = False
-        load_adapters()
 
         channels = await db.channels.list()
-        logger.info(f"Found {len(channels)} channel(s), auto-starting all")
+        logger.info("Found %s channel(s), auto-starting all", len(channels))
 
-        for ch in channels:
-            try:
-                await self.start_channel(ch["id"])
-            except ValueError:
-                # Config / adapter errors — permanent, do not retry
-                logger.error(
-                    f"Channel {ch['id']} ({ch.get('name')}) has a "
-                    f"configuration error — will not retry"
-                )
-            except Exception:
-                logger.exception(
-                    f"Failed to start channel {ch['id']} ({ch.get('name')}) "
-                    f"during startup — will retry automatically"
-                )
-                self._schedule_retry(ch["id"])
+        # Channels start independently, so bring them up concurrently
+        await asyncio.gather(
+            *(self._safe_start(ch["id"], ch.get("name")) for ch in channels)
+        )
+
+    async def _safe_start(self, channel_id: str, name: Optional[str]) -> None:
+        """Start a channel during startup, logging failures instead of raising."""
+        try:
+            await self.start_channel(channel_id)
+        except ValueError:
+            # Config / adapter errors — permanent, do not retry
+            logger.error(
+                "Channel %s (%s) has a "
+                "configuration error — will not retry",
+                channel_id, name
+            )
+        except Exception:
+            logger.exception(
+                "Failed to start channel %s (%s) "
+                "during startup — will retry automatically",
+                channel_id, name
+            )
+            self._schedule_retry(channel_id)
 
     async def shutdown(self) -> None:
         """Gracefully stop every running channel and cancel pending retries."""
@@ -141,15 +209,19 @@ class ChannelGateway:
         self._retry_tasks.clear()
 
         channel_ids = list(self._adapters.keys())
-        for channel_id in channel_ids:
-            try:
-                await self.stop_channel(channel_id)
-            except Exception:
-                logger.exception(f"Error stopping channel {channel_id} during shutdown")
+        await asyncio.gather(*(self._safe_stop(cid) for cid in channel_ids))
         self._rate_limiter.clear()
+        self._rate_notice_sent.clear()
         self._channel_cache.clear()
         logger.info("ChannelGateway shutdown complete")
 
+    async def _safe_stop(self, channel_id: str) -> None:
+        """Stop a channel during shutdown, logging failures instead of raising."""
+        try:
+            await self.stop_channel(channel_id)
+        except Exception:
+            logger.exception("Error stopping channel %s during shutdown", channel_id)
+
     # ------------------------------------------------------------------
     # Channel start / stop / restart
     # ------------------------------------------------------------------
@@ -162,7 +234,7 @@ class ChannelGateway:
         adapter), or ``'failed'`` for runtime crashes (retriable).
         """
         if channel_id in self._adapters:
-            logger.warning(f"Channel {channel_id} is already running; stopping first")
+            logger.warning("Channel %s is already running; stopping first", channel_id)
             await self.stop_channel(channel_id)
 
         channel = await db.channels.get(channel_id)
@@ -177,18 +249,12 @@ class ChannelGateway:
             await db.channels.update(channel_id, {"status": "error", "error_message": error_msg})
             raise ValueError(error_msg)
 
-        config = channel.get("config", {})
-        if isinstance(config, str):
-            import json
-            try:
-                config = json.loads(config)
-            except json.JSONDecodeError:
-                config = {}
+        channel = _normalize_channel(channel)
 
         # Create the adapter, injecting our message handler
         adapter = adapter_cls(
             channel_id=channel_id,
-            config=config,
+            config=channel["config"],
             on_message=self.handle_inbound_message,
         )
         adapter.set_on_error(self._handle_adapter_error)
@@ -224,14 +290,14 @@ class ChannelGateway:
             try:
                 await adp.start()
             except asyncio.CancelledError:
-                logger.info(f"Adapter task for channel {cid} cancelled")
+                logger.info("Adapter task for channel %s cancelled", cid)
             except Exception:
                 # If the adapter was already removed by stop_channel() or
                 # shutdown, this crash is a side-effect of cancellation —
                 # do not update DB or schedule retry.
                 if cid not in self._adapters or self._shutting_down:
                     return
-                logger.exception(f"Adapter for channel {cid} crashed")
+                logger.exception("Adapter for channel %s crashed", cid)
                 await db.channels.update(cid, {
                     "status": "failed",
                     "error_message": "Adapter crashed unexpectedly",
@@ -243,12 +309,12 @@ class ChannelGateway:
                 # Schedule automatic retry
                 self._schedule_retry(cid)
 
-        task = asyncio.create_task(_run_adapter(channel_id, adapter))
+        task = self._spawn(_run_adapter(channel_id, adapter))
         self._adapters[channel_id] = adapter
         self._tasks[channel_id] = task
 
         await db.channels.update(channel_id, {"status": "active", "error_message": None})
-        logger.info(f"Channel {channel_id} ({channel.get('name')}) started successfully")
+        logger.info("Channel %s (%s) started successfully", channel_id, channel.get('name'))
 
     async def stop_channel(self, channel_id: str) -> None:
         """Stop a running channel adapter and update DB status to ``'inactive'``.
@@ -269,7 +335,7 @@ class ChannelGateway:
             try:
                 await adapter.stop()
             except Exception:
-                logger.exception(f"Error in adapter.stop() for channel {channel_id}")
+                logger.exception("Error in adapter.stop() for channel %s", channel_id)
 
         if task is not None and not task.done():
             task.cancel()
@@ -278,16 +344,25 @@ class ChannelGateway:
             except asyncio.CancelledError:
                 pass
             except Exception:
-                logger.exception(f"Error cancelling task for channel {channel_id}")
+                logger.exception("Error cancelling task for channel %s", channel_id)
 
         await db.channels.update(channel_id, {"status": "inactive", "error_message": None})
-        logger.info(f"Channel {channel_id} stopped")
+        logger.info("Channel %s stopped", channel_id)
 
     async def restart_channel(self, channel_id: str) -> None:
         """Stop and re-start a channel."""
         await self.stop_channel(channel_id)
         await self.start_channel(channel_id)
 
+    def invalidate_channel(self, channel_id: str) -> None:
+        """Drop the cached record for *channel_id* after its DB row changed.
+
+        The next inbound message reloads it, so edits to access control,
+        rate limits, agent or feature flags apply without a restart.
+        Adapter credentials (``config``) still require a restart to apply.
+        """
+        self._channel_cache.pop(channel_id, None)
+
     # ------------------------------------------------------------------
     # Adapter error callback
     # ------------------------------------------------------------------
@@ -301,7 +376,7 @@ class ChannelGateway:
         if self._shutting_down or channel_id not in self._adapters:
             return
 
-        logger.error(f"Adapter error callback for channel {channel_id}: {error_message}")
+        logger.error("Adapter error callback for channel %s: %s", channel_id, error_message)
 
         adapter = self._adapters.pop(channel_id, None)
         self._tasks.pop(channel_id, None)
@@ -314,7 +389,7 @@ class ChannelGateway:
             try:
                 await adapter.stop()
             except Exception:
-                logger.exception(f"Error stopping adapter during error handling for channel {channel_id}")
+                logger.exception("Error stopping adapter during error handling for channel %s", channel_id)
 
         await db.channels.update(channel_id, {
             "status": "failed",
@@ -333,9 +408,16 @@ class ChannelGateway:
             return
         if channel_id in self._retry_tasks and not self._retry_tasks[channel_id].done():
             return  # retry already scheduled
-        task = asyncio.create_task(self._retry_loop(channel_id))
+        task = self._spawn(self._retry_loop(channel_id))
         self._retry_tasks[channel_id] = task
 
+    def _spawn(self, coro) -> asyncio.Task:
+        """Create a task and hold a strong reference to it until it is done."""
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
+
     async def _retry_loop(self, channel_id: str) -> None:
         """Retry starting a channel with exponential backoff.
 
@@ -349,8 +431,9 @@ class ChannelGateway:
                 attempt += 1
                 if attempt > self._RETRY_MAX_ATTEMPTS:
                     logger.error(
-                        f"Channel {channel_id}: max retries ({self._RETRY_MAX_ATTEMPTS}) "
-                        f"exhausted — giving up"
+                        "Channel %s: max retries (%s) "
+                        "exhausted — giving up",
+                        channel_id, self._RETRY_MAX_ATTEMPTS
                     )
                     await db.channels.update(channel_id, {
                         "status": "error",
@@ -359,7 +442,8 @@ class ChannelGateway:
                     break
 
                 logger.info(
-                    f"Retry #{attempt} for channel {channel_id} in {delay:.0f}s"
+                    "Retry #%s for channel %s in %.0fs",
+                    attempt, channel_id, delay
                 )
                 await asyncio.sleep(delay)
 
@@ -367,26 +451,28 @@ class ChannelGateway:
                     break
                 # If channel was started successfully by another path, stop retrying
                 if channel_id in self._adapters:
-                    logger.info(f"Channel {channel_id} is already running, stopping retry")
+                    logger.info("Channel %s is already running, stopping retry", channel_id)
                     break
 
                 try:
                     await self.start_channel(channel_id)
-                    logger.info(f"Channel {channel_id} reconnected on retry #{attempt}")
+                    logger.info("Channel %s reconnected on retry #%s", channel_id, attempt)
                     break  # success
                 except ValueError:
                     # Permanent config / adapter error — no point retrying
                     logger.error(
-                        f"Channel {channel_id}: permanent error on retry "
-                        f"#{attempt} — stopping retries"
+                        "Channel %s: permanent error on retry "
+                        "#%s — stopping retries",
+                        channel_id, attempt
                     )
                     break
                 except Exception:
+                    delay = min(delay * self._RETRY_BACKOFF_FACTOR, self._RETRY_MAX_DELAY)
                     logger.warning(
-                        f"Retry #{attempt} failed for channel {channel_id}, "
-                        f"next attempt in {min(delay * self._RETRY_BACKOFF_FACTOR, self._RETRY_MAX_DELAY):.0f}s"
+                        "Retry #%s failed for channel %s, "
+                        "next attempt in %.0fs",
+                        attempt, channel_id, delay
                     )
-                    delay = min(delay * self._RETRY_BACKOFF_FACTOR, self._RETRY_MAX_DELAY)
         finally:
             self._retry_tasks.pop(channel_id, None)
 
@@ -454,8 +540,8 @@ class ChannelGateway:
         """
         channel_id = msg.channel_id
         logger.info(
-            f"Inbound message on channel {channel_id} from "
-            f"{msg.sender_display_name or msg.external_sender_id}"
+            "Inbound message on channel %s from %s",
+            channel_id, msg.sender_display_name or msg.external_sender_id
         )
 
         # 1. Load channel config -------------------------------------------------
@@ -463,20 +549,22 @@ class ChannelGateway:
         if not channel:
             channel = await db.channels.get(channel_id)
             if not channel:
-                logger.error(f"Channel {channel_id} not found; dropping message")
+                logger.error("Channel %s not found; dropping message", channel_id)
                 return
+            channel = _normalize_channel(channel)
             self._channel_cache[channel_id] = channel
 
         agent_id = channel.get("agent_id")
         if not agent_id:
-            logger.error(f"Channel {channel_id} has no agent_id; dropping message")
+            logger.error("Channel %s has no agent_id; dropping message", channel_id)
             return
 
         # 2. Access control -------------------------------------------------------
         if not self._check_access(channel, msg.external_sender_id):
             logger.warning(
-                f"Access denied for sender {msg.external_sender_id} "
-                f"on channel {channel_id}"
+                "Access denied for sender %s "
+                "on channel %s",
+                msg.external_sender_id, channel_id
             )
             return
 
@@ -484,12 +572,14 @@ class ChannelGateway:
         rate_limit = channel.get("rate_limit_per_minute", 10)
         if not self._rate_limiter.is_allowed(msg.external_sender_id, rate_limit):
             logger.warning(
-                f"Rate limit exceeded for sender {msg.external_sender_id} "
-                f"on channel {channel_id}"
+                "Rate limit exceeded for sender %s "
+                "on channel %s",
+                msg.external_sender_id, channel_id
             )
-            # Best effort: send a polite rate-limit notice back to the user
+            # Best effort: send a polite rate-limit notice back to the user,
+            # debounced so a flooding sender does not trigger one send per message
             adapter = self._adapters.get(channel_id)
-            if adapter:
+            if adapter and self._should_send_rate_notice(msg.external_sender_id):
                 try:
                     await adapter.send_message(OutboundMessage(
                         channel_id=channel_id,
@@ -513,57 +603,48 @@ class ChannelGateway:
                 sender_display_name=msg.sender_display_name,
             )
         except Exception:
-            logger.exception(f"Failed to resolve session for channel {channel_id}")
+            logger.exception("Failed to resolve session for channel %s", channel_id)
             return
 
-        # Log inbound message to channel_messages ---------------------------------
-        inbound_record_id = str(uuid4())
-        try:
-            await db.channel_messages.put({
-                "id": inbound_record_id,
-                "channel_session_id": channel_session_id,
-                "direction": "inbound",
-                "external_message_id": msg.external_message_id,
-                "content": msg.text or "[Attachment message]",
-                "content_type": msg.metadata.get("message_type", "text"),
-                "metadata": {
-                    **msg.metadata,
-                    "attachment_count": len(msg.attachments),
-                    "attachment_names": [a.get("file_name") for a in msg.attachments],
-                },
-                "status": "received",
-            })
-        except Exception:
-            logger.exception("Failed to log inbound channel message")
+        # Log inbound message to channel_messages (in the background) ----------
+        self._spawn(self._log_inbound_message({
+            "id": str(uuid4()),
+            "channel_session_id": channel_session_id,
+            "direction": "inbound",
+            "external_message_id": msg.external_message_id,
+            "content": msg.text or "[Attachment message]",
+            "content_type": msg.metadata.get("message_type", "text"),
+            "metadata": {
+                **msg.metadata,
+                "attachment_count": len(msg.attachments),
+                "attachment_names": [a.get("file_name") for a in msg.attachments],
+            },
+            "status": "received",
+        }))
 
         # 5. Run agent conversation -----------------------------------------------
         enable_skills = bool(channel.get("enable_skills", False))
         enable_mcp = bool(channel.get("enable_mcp", False))
 
         # Build channel context for MCP tool injection (e.g. send_file)
-        channel_config = channel.get("config", {})
-        if isinstance(channel_config, str):
-            import json
-            try:
-                channel_config = json.loads(channel_config)
-            except json.JSONDecodeError:
-                channel_config = {}
-
         channel_context = {
-            "channel_type": channel.get("channel_type", ""),
-            "channel_id": channel_id,
+            **channel["_static_context"],
             "chat_id": msg.external_chat_id,
             "reply_to_message_id": msg.external_message_id,
-            # Extract only the credential keys needed by channel adapters
-            "app_id": channel_config.get("app_id", ""),
-            "app_secret": channel_config.get("app_secret", ""),
         }
 
         # Prepare message text (stages attachments to workspace if present)
         final_text = await self._prepare_message_text(msg, agent_id)
+        if not final_text and not msg.attachments:
+            logger.warning("Empty message on channel %s; skipping agent run", channel_id)
+            return
 
+        state = _ConversationState(
+            channel_id=channel_id,
+            channel_session_id=channel_session_id,
+            session_id=session_id,
+        )
         reply_text = ""
-        error_occurred = False
         try:
             # For new sessions (is_new=True, i.e. message_count==0), pass
             # session_id=None so the SDK creates a fresh session.  The SDK
@@ -573,6 +654,7 @@ class ChannelGateway:
             # exchange, the stored session_id IS the SDK session_id and
             # can be used to resume.
             resume_sid = None if _is_new else session_id
+            handlers = self._EVENT_HANDLERS
             async for event in agent_manager.run_conversation(
                 agent_id=agent_id,
                 user_message=final_text,
@@ -581,76 +663,23 @@ class ChannelGateway:
                 enable_mcp=enable_mcp,
                 channel_context=channel_context,
             ):
-                event_type = event.get("type", "")
-
-                if event_type == "assistant":
-                    # Keep only the last assistant message as the reply.
-                    # In multi-step conversations (assistant speaks → tool
-                    # call → assistant speaks again), intermediate messages
-                    # are not meaningful to send back; only the final
-                    # response matters.
-                    current_text = ""
-                    content_blocks = event.get("content", [])
-                    for block in content_blocks:
-                        if isinstance(block, dict) and block.get("type") == "text":
-                            text = block.get("text", "")
-                            if text:
-                                current_text += text
-                    if current_text:
-                        reply_text = current_text
-
-                elif event_type == "session_start":
-                    # If the SDK provides a new session ID, update our mapping
-                    new_sid = event.get("sessionId")
-                    if new_sid and new_sid != session_id:
-                        session_id = new_sid
-                        # Update the channel_session record to point to the
-                        # SDK-assigned session ID
-                        try:
-                            await db.channel_sessions.update(
-                                channel_session_id,
-                                {"session_id": session_id},
-                            )
-                        except Exception:
-                            logger.exception("Failed to update channel_session with new session_id")
-
-                elif event_type == "result":
-                    # Conversation finished — may include an error subtype
-                    subtype = event.get("subtype", "")
-                    cost = event.get("totalCostUsd")
-                    duration = event.get("durationMs")
-                    logger.info(
-                        f"Agent conversation complete for channel {channel_id} "
-                        f"session {session_id} "
-                        f"(subtype={subtype}, cost=${cost}, duration={duration}ms)"
-                    )
-                    if subtype and "error" in subtype:
-                        error_detail = event.get("error") or event.get("message") or subtype
-                        logger.error(
-                            f"Agent result error on channel {channel_id}: {error_detail}"
-                        )
-                        if not reply_text:
-                            reply_text = f"Sorry, the agent encountered an error: {error_detail}"
-                        error_occurred = True
-
-                elif event_type == "error":
-                    error_msg = event.get("error") or event.get("message") or "Unknown error"
-                    logger.error(
-                        f"Agent error on channel {channel_id}: {error_msg}"
-                    )
-                    if not reply_text:
-                        reply_text = "Sorry, I encountered an error processing your request."
-                    error_occurred = True
-
                 # Silently consume tool_use, tool_result, ask_user_question, etc.
+                handler = handlers.get(event.get("type", ""))
+                if handler is not None:
+                    await handler(self, event, state)
 
         except Exception:
-            logger.exception(f"Exception running agent conversation on channel {channel_id}")
+            logger.exception("Exception running agent conversation on channel %s", channel_id)
             reply_text = "Sorry, an unexpected error occurred. Please try again later."
-            error_occurred = True
+            state.error_occurred = True
 
+        error_occurred = state.error_occurred
         if not reply_text:
-            reply_text = "(No response generated)"
+            reply_text = (
+                "".join(b["text"] for b in state.last_text_blocks if _is_text_block(b))
+                or state.fallback_text
+                or "(No response generated)"
+            )
 
         # 6. Send outbound reply --------------------------------------------------
         outbound = OutboundMessage(
@@ -667,36 +696,125 @@ class ChannelGateway:
             try:
                 external_message_id = await adapter.send_message(outbound)
             except Exception:
-                logger.exception(f"Failed to send outbound message on channel {channel_id}")
-
-        # 7. Log outbound message -------------------------------------------------
-        try:
-            await db.channel_messages.put({
-                "id": str(uuid4()),
-                "channel_session_id": channel_session_id,
-                "direction": "outbound",
-                "external_message_id": external_message_id,
-                "content": reply_text,
-                "content_type": "text",
-                "metadata": {},
-                "status": "error" if error_occurred else "sent",
-            })
-        except Exception:
-            logger.exception("Failed to log outbound channel message")
-
-        # Update channel_session last_message_at & message_count ----------------
+                logger.exception("Failed to send outbound message on channel %s", channel_id)
+
+        # 7. Log outbound message and update session counters -----------------
+        outbound_record = {
+            "id": str(uuid4()),
+            "channel_session_id": channel_session_id,
+            "direction": "outbound",
+            "external_message_id": external_message_id,
+            "content": reply_text,
+            "content_type": "text",
+            "metadata": {},
+            "status": "error" if error_occurred else "sent",
+        }
         # Only increment message_count on success so that failed first
         # attempts keep message_count == 0, allowing the next attempt to
         # start a fresh SDK session instead of trying to resume.
+        log_result, count_result = await asyncio.gather(
+            db.channel_messages.put(outbound_record),
+            db.channel_sessions.increment_message_count(
+                channel_session_id,
+                0 if error_occurred else 2,
+                _now_iso(),
+            ),
+            return_exceptions=True,
+        )
+        if isinstance(log_result, Exception):
+            logger.error("Failed to log outbound channel message", exc_info=log_result)
+        if isinstance(count_result, Exception):
+            logger.error("Failed to update channel_session counters", exc_info=count_result)
+
+    @staticmethod
+    async def _log_inbound_message(record: dict) -> None:
+        """Write an inbound audit record; failures are logged, not raised."""
         try:
-            updates = {"last_message_at": datetime.now().isoformat()}
-            if not error_occurred:
-                existing_cs = await db.channel_sessions.get(channel_session_id)
-                count = (existing_cs.get("message_count", 0) if existing_cs else 0) + 2
-                updates["message_count"] = count
-            await db.channel_sessions.update(channel_session_id, updates)
+            await db.channel_messages.put(record)
         except Exception:
-            logger.exception("Failed to update channel_session counters")
+            logger.exception("Failed to log inbound channel message")
+
+    # ------------------------------------------------------------------
+    # Agent event handlers (dispatched by event type)
+    # ------------------------------------------------------------------
+
+    async def _on_assistant_event(self, event: dict, state: _ConversationState) -> None:
+        # Keep only the last assistant message as the reply.
+        # In multi-step conversations (assistant speaks → tool
+        # call → assistant speaks again), intermediate messages
+        # are not meaningful to send back; only the final
+        # response matters.
+        content_blocks = event.get("content", [])
+        if any(_is_text_block(b) for b in content_blocks):
+            state.last_text_blocks = content_blocks
+
+    async def _on_session_start_event(self, event: dict, state: _ConversationState) -> None:
+        # If the SDK provides a new session ID, update our mapping
+        new_sid = event.get("sessionId")
+        if new_sid and new_sid != state.session_id:
+            state.session_id = new_sid
+            # Update the channel_session record to point to the
+            # SDK-assigned session ID
+            try:
+                await db.channel_sessions.update(
+                    state.channel_session_id,
+                    {"session_id": new_sid},
+                )
+            except Exception:
+                logger.exception("Failed to update channel_session with new session_id")
+
+    async def _on_result_event(self, event: dict, state: _ConversationState) -> None:
+        # Conversation finished — may include an error subtype
+        subtype = event.get("subtype", "")
+        logger.info(
+            "Agent conversation complete for channel %s "
+            "session %s "
+            "(subtype=%s, cost=$%s, duration=%sms)",
+            state.channel_id, state.session_id, subtype,
+            event.get("totalCostUsd"), event.get("durationMs")
+        )
+        if subtype and "error" in subtype:
+            error_detail = event.get("error") or event.get("message") or subtype
+            logger.error(
+                "Agent result error on channel %s: %s",
+                state.channel_id, error_detail
+            )
+            if not state.fallback_text:
+                state.fallback_text = f"Sorry, the agent encountered an error: {error_detail}"
+            state.error_occurred = True
+
+    async def _on_error_event(self, event: dict, state: _ConversationState) -> None:
+        error_msg = event.get("error") or event.get("message") or "Unknown error"
+        logger.error(
+            "Agent error on channel %s: %s",
+            state.channel_id, error_msg
+        )
+        if not state.fallback_text:
+            state.fallback_text = "Sorry, I encountered an error processing your request."
+        state.error_occurred = True
+
+    _EVENT_HANDLERS = {
+        "assistant": _on_assistant_event,
+        "session_start": _on_session_start_event,
+        "result": _on_result_event,
+        "error": _on_error_event,
+    }
+
+    def _should_send_rate_notice(self, sender_id: str) -> bool:
+        """Return True (and record it) if *sender_id* may get a rate-limit notice now."""
+        now = time.monotonic()
+        sent = self._rate_notice_sent
+        # Entries older than the interval no longer suppress anything
+        cutoff = now - self._RATE_NOTICE_INTERVAL
+        while sent:
+            oldest = next(iter(sent))
+            if sent[oldest] > cutoff:
+                break
+            del sent[oldest]
+        if sender_id in sent:
+            return False
+        sent[sender_id] = now
+        return True
 
     # ------------------------------------------------------------------
     # Attachment staging
@@ -711,15 +829,27 @@ class ChannelGateway:
         if not msg.attachments:
             return msg.text
 
-        staged_lines: list[str] = []
-        for attachment in msg.attachments:
-            file_name = attachment.get("file_name", "attachment")
+        async def _stage(attachment: dict) -> Optional[str]:
+            # Adapters may defer the download until the content is needed.
+            download = attachment.get("download")
+            if download is not None and not attachment.get("file_bytes"):
+                await download()
             file_bytes = attachment.get("file_bytes", b"")
             if not file_bytes:
-                continue
-            path = await self._stage_file_to_workspace(agent_id, file_name, file_bytes)
-            if path:
-                staged_lines.append(f"[File '{file_name}' saved to: {path}]")
+                return None
+            return await self._stage_file_to_workspace(
+                agent_id,
+                attachment.get("file_name", "attachment"),
+                file_bytes,
+            )
+
+        # Download and stage all attachments concurrently; gather keeps order
+        paths = await asyncio.gather(*(_stage(a) for a in msg.attachments))
+        staged_lines = [
+            f"[File '{a.get('file_name', 'attachment')}' saved to: {path}]"
+            for a, path in zip(msg.attachments, paths)
+            if path
+        ]
 
         if not staged_lines and not msg.text:
             return ""
@@ -738,23 +868,11 @@ class ChannelGateway:
 
         Returns the absolute file path on success, or None on failure.
         """
+        base_dir = workspace_manager.agents_workspace / agent_id / "channel_files"
         try:
-            base_dir = workspace_manager.agents_workspace / agent_id / "channel_files"
-            base_dir.mkdir(parents=True, exist_ok=True)
-
-            safe_name = _sanitize_filename(file_name)
-            target = base_dir / safe_name
-
-            # Handle filename collisions with a counter suffix
-            if target.exists():
-                stem = target.stem
-                suffix = target.suffix
-                counter = 1
-                while target.exists():
-                    target = base_dir / f"{stem}_{counter}{suffix}"
-                    counter += 1
-
-            target.write_bytes(file_bytes)
+            target = await asyncio.to_thread(
+                _write_staged_file, base_dir, _sanitize_filename(file_name), file_bytes
+            )
             logger.info("Staged file '%s' to %s", file_name, target)
             return str(target)
         except Exception:
@@ -792,8 +910,9 @@ class ChannelGateway:
             # before the SDK assigned a real session ID, so we must start fresh.
             is_new = (existing.get("message_count", 0) or 0) == 0
             logger.debug(
-                f"Resolved existing session {existing['session_id']} "
-                f"for external chat {external_chat_id} (is_new={is_new})"
+                "Resolved existing session %s "
+                "for external chat %s (is_new=%s)",
+                existing['session_id'], external_chat_id, is_new
             )
             return existing["session_id"], existing["id"], is_new
 
@@ -817,13 +936,14 @@ class ChannelGateway:
             "session_id": session_id,
             "agent_id": agent_id,
             "sender_display_name": sender_display_name,
-            "last_message_at": datetime.now().isoformat(),
+            "last_message_at": _now_iso(),
             "message_count": 0,
         })
 
         logger.info(
-            f"Created new session {session_id} (channel_session {channel_session_id}) "
-            f"for external chat {external_chat_id} on channel {channel_id}"
+            "Created new session %s (channel_session %s) "
+            "for external chat %s on channel %s",
+            session_id, channel_session_id, external_chat_id, channel_id
         )
         return session_id, channel_session_id, True
 
@@ -842,6 +962,9 @@ class ChannelGateway:
         * ``"blocklist"``  -- everyone *except* senders in ``blocked_senders``.
 
         If the mode is missing or unrecognised the default is to **deny**.
+        Sender lists are looked up in the frozensets built by
+        :func:`_normalize_channel`; a record that skipped normalization gets
+        them built and stored on first use.
         """
         access_mode = channel_config.get("access_mode", "allowlist")
 
@@ -849,28 +972,24 @@ class ChannelGateway:
             return True
 
         if access_mode == "allowlist":
-            allowed = channel_config.get("allowed_senders", [])
-            if isinstance(allowed, str):
-                import json
-                try:
-                    allowed = json.loads(allowed)
-                except json.JSONDecodeError:
-                    allowed = []
             # Empty allowlist => no one is allowed (secure default)
+            allowed = channel_config.get("_allowed_set")
+            if allowed is None:
+                allowed = channel_config["_allowed_set"] = _sender_set(
+                    channel_config.get("allowed_senders")
+                )
             return sender_id in allowed
 
         if access_mode == "blocklist":
-            blocked = channel_config.get("blocked_senders", [])
-            if isinstance(blocked, str):
-                import json
-                try:
-                    blocked = json.loads(blocked)
-                except json.JSONDecodeError:
-                    blocked = []
+            blocked = channel_config.get("_blocked_set")
+            if blocked is None:
+                blocked = channel_config["_blocked_set"] = _sender_set(
+                    channel_config.get("blocked_senders")
+                )
             return sender_id not in blocked
 
         # Unknown mode -- deny by default
-        logger.warning(f"Unknown access_mode '{access_mode}'; denying access")
+        logger.warning("Unknown access_mode '%s'; denying access", access_mode)
         return False
 
 
@@ -878,8 +997,114 @@ class ChannelGateway:
 # Helpers
 # ---------------------------------------------------------------------------
 
-# Characters not allowed in staged filenames (path separators + shell-dangerous)
-_UNSAFE_FILENAME_RE = _re.compile(r'[/\\:*?"<>|;\x00-\x1f]')
+_now_iso_cache: tuple[int, str] = (0, "")
+
+
+def _now_iso() -> str:
+    """``datetime.now().isoformat()``, memoized for the current second.
+
+    Used for ``last_message_at`` bookkeeping, where sub-second precision
+    does not matter, so bursts of messages skip the formatting work.
+    """
+    global _now_iso_cache
+    second = int(time.time())
+    cached_second, cached = _now_iso_cache
+    if second != cached_second:
+        cached = datetime.now().isoformat()
+        _now_iso_cache = (second, cached)
+    return cached
+
+
+def _is_text_block(block) -> bool:
+    """True for a non-empty ``{"type": "text"}`` assistant content block."""
+    return isinstance(block, dict) and block.get("type") == "text" and bool(block.get("text"))
+
+
+def _decode_json_field(value, default):
+    """Return *value* decoded from JSON if it is a string, else unchanged."""
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return default
+    return value if value is not None else default
+
+
+def _normalize_channel(channel: dict) -> dict:
+    """Return a copy of a channel record with its JSON fields pre-decoded.
+
+    Done once when the record is cached so the per-message path never
+    re-parses JSON:
+
+    * ``config`` is always a dict.
+    * ``_allowed_set`` / ``_blocked_set`` are frozensets of sender IDs built
+      from ``allowed_senders`` / ``blocked_senders``.
+    * ``_static_context`` holds the per-channel part of the channel context
+      passed to the agent (MCP tool injection, e.g. send_file).
+    """
+    channel = dict(channel)
+    config = _decode_json_field(channel.get("config"), {})
+    if not isinstance(config, dict):
+        config = {}
+    channel["config"] = config
+    channel["_static_context"] = {
+        "channel_type": channel.get("channel_type", ""),
+        "channel_id": channel.get("id"),
+        # Extract only the credential keys needed by channel adapters
+        "app_id": config.get("app_id", ""),
+        "app_secret": config.get("app_secret", ""),
+    }
+    channel["_allowed_set"] = _sender_set(channel.get("allowed_senders"))
+    channel["_blocked_set"] = _sender_set(channel.get("blocked_senders"))
+    return channel
+
+
+def _sender_set(value) -> frozenset:
+    """Build a frozenset of sender IDs from a JSON string or list."""
+    senders = _decode_json_field(value, [])
+    if not isinstance(senders, (list, tuple, set, frozenset)):
+        return frozenset()
+    return frozenset(senders)
+
+
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+
+def _write_staged_file(base_dir: Path, safe_name: str, file_bytes: bytes) -> Path:
+    """Blocking part of attachment staging; run via ``asyncio.to_thread``.
+
+    Claims a free name with an exclusive create (appending ``_1``, ``_2``,
+    ... on collision) so concurrent stagings can never pick the same
+    target, then writes *file_bytes* to it.
+    """
+    base_dir.mkdir(parents=True, exist_ok=True)
+    stem, dot, ext = safe_name.rpartition(".")
+    if not stem:
+        stem, dot, ext = safe_name, "", ""
+    target = base_dir / safe_name
+    counter = 0
+    while True:
+        try:
+            fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_EXCL | _O_BINARY, 0o644)
+            break
+        except FileExistsError:
+            counter += 1
+            target = base_dir / f"{stem}_{counter}{dot}{ext}"
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(file_bytes)
+    except BaseException:
+        target.unlink(missing_ok=True)
+        raise
+    return target
+
+
+# Characters not allowed in staged filenames (path separators + shell-dangerous),
+# mapped to "_" in a single str.translate pass
+_UNSAFE_FILENAME_TABLE = str.maketrans(
+    {c: "_" for c in '/\\:*?"<>|;'} | {i: "_" for i in range(0x20)}
+)
 
 
 def _sanitize_filename(name: str) -> str:
@@ -890,9 +1115,11 @@ def _sanitize_filename(name: str) -> str:
     """
     # Take only the basename in case the name contains path components
     name = name.rsplit("/", 1)[-1].rsplit("\\", 1)[-1]
-    name = _UNSAFE_FILENAME_RE.sub("_", name)
+    name = name.translate(_UNSAFE_FILENAME_TABLE)
     # Collapse consecutive underscores
-    name = _re.sub(r"_+", "_", name).strip("_")
+    while "__" in name:
+        name = name.replace("__", "_")
+    name = name.strip("_")
     return name or "attachment"
 
 
@@ -3,9 +3,15 @@
 Maps channel type strings to adapter classes. Adapters register themselves
 at import time. The registry only includes adapters whose dependencies
 are available.
+
+Adapter modules are imported on first use of their channel type, so the
+SDKs behind them (lark-oapi, ...) are only loaded when a channel of that
+type is actually configured.
 """
 from __future__ import annotations
 
+import functools
+import importlib
 import logging
 from typing import Optional, Type
 
@@ -15,87 +21,128 @@ logger = logging.getLogger(__name__)
 
 _ADAPTER_REGISTRY: dict[str, Type[ChannelAdapter]] = {}
 
+# channel_type -> module that registers its adapter on import
+_ADAPTER_MODULES: dict[str, str] = {
+    "feishu": "channels.adapters.feishu",
+    # Future: "slack": "channels.adapters.slack",
+    # Future: "discord": "channels.adapters.discord",
+}
+
+# Channel types whose adapter module failed to import
+_UNAVAILABLE: set[str] = set()
+
+# Entries kept by the get_adapter_class cache: ample for the known types
+_ADAPTER_LOOKUP_CACHE_SIZE = 32
+
+
+# Static metadata for list_supported_types; "available" is added per call
+_TYPE_INFO_TEMPLATE: tuple[dict, ...] = (
+    {
+        "id": "feishu",
+        "label": "Feishu (飞书)",
+        "description": "Connect to Feishu/Lark via WebSocket long connection",
+        "config_fields": [
+            {"key": "app_id", "label": "App ID", "type": "text", "required": True},
+            {"key": "app_secret", "label": "App Secret", "type": "password", "required": True},
+        ],
+    },
+    {
+        "id": "slack",
+        "label": "Slack",
+        "description": "Connect to Slack via Socket Mode",
+        "config_fields": [
+            {"key": "bot_token", "label": "Bot Token (xoxb-)", "type": "password", "required": True},
+            {"key": "app_token", "label": "App Token (xapp-)", "type": "password", "required": True},
+        ],
+    },
+    {
+        "id": "discord",
+        "label": "Discord",
+        "description": "Connect to Discord via Gateway WebSocket",
+        "config_fields": [
+            {"key": "bot_token", "label": "Bot Token", "type": "password", "required": True},
+            {"key": "guild_id", "label": "Guild ID (optional)", "type": "text", "required": False},
+        ],
+    },
+    {
+        "id": "web_widget",
+        "label": "Web Widget",
+        "description": "Embeddable chat widget for websites",
+        "config_fields": [
+            {"key": "allowed_origins", "label": "Allowed Origins", "type": "text_list", "required": False},
+            {"key": "widget_theme", "label": "Theme", "type": "select", "options": ["light", "dark"], "required": False},
+            {"key": "greeting_message", "label": "Greeting Message", "type": "text", "required": False},
+        ],
+    },
+)
+
 
 def register_adapter(channel_type: str, adapter_class: Type[ChannelAdapter]) -> None:
     """Register a channel adapter class for a given type."""
     _ADAPTER_REGISTRY[channel_type] = adapter_class
-    logger.info(f"Registered channel adapter: {channel_type}")
+    get_adapter_class.cache_clear()
+    list_supported_types.cache_clear()
+    logger.info("Registered channel adapter: %s", channel_type)
 
 
+@functools.lru_cache(maxsize=_ADAPTER_LOOKUP_CACHE_SIZE)
 def get_adapter_class(channel_type: str) -> Optional[Type[ChannelAdapter]]:
-    """Get the adapter class for a channel type."""
-    return _ADAPTER_REGISTRY.get(channel_type)
+    """Get the adapter class for a channel type, importing it if needed.
+
+    Lookups are cached per channel type; registering an adapter clears the
+    cache.  The cache is bounded because misses for unknown type strings
+    (cached as None) would otherwise accumulate.
+    """
+    adapter_class = _ADAPTER_REGISTRY.get(channel_type)
+    if adapter_class is None:
+        adapter_class = load_adapter(channel_type)
+    return adapter_class
+
+
+def load_adapter(channel_type: str) -> Optional[Type[ChannelAdapter]]:
+    """Import the adapter module for *channel_type* to trigger registration.
+
+    Returns the registered adapter class, or None if the type is unknown or
+    its dependencies are not installed.  Import failures are remembered so
+    the import is attempted only once.
+    """
+    if channel_type in _ADAPTER_REGISTRY:
+        return _ADAPTER_REGISTRY[channel_type]
+    module_name = _ADAPTER_MODULES.get(channel_type)
+    if module_name is None or channel_type in _UNAVAILABLE:
+        return None
+    try:
+        importlib.import_module(module_name)
+    except ImportError:
+        logger.info("%s adapter not available (dependencies not installed)", channel_type)
+        _UNAVAILABLE.add(channel_type)
+        return None
+    adapter_class = _ADAPTER_REGISTRY.get(channel_type)
+    if adapter_class is None:
+        # Module imported but skipped registration (missing optional SDK)
+        _UNAVAILABLE.add(channel_type)
+    return adapter_class
 
 
+@functools.lru_cache(maxsize=1)
 def list_supported_types() -> list[dict]:
-    """List all supported channel types with metadata."""
-    type_info = {
-        "feishu": {
-            "id": "feishu",
-            "label": "Feishu (飞书)",
-            "description": "Connect to Feishu/Lark via WebSocket long connection",
-            "config_fields": [
-                {"key": "app_id", "label": "App ID", "type": "text", "required": True},
-                {"key": "app_secret", "label": "App Secret", "type": "password", "required": True},
-            ],
-        },
-        "slack": {
-            "id": "slack",
-            "label": "Slack",
-            "description": "Connect to Slack via Socket Mode",
-            "config_fields": [
-                {"key": "bot_token", "label": "Bot Token (xoxb-)", "type": "password", "required": True},
-                {"key": "app_token", "label": "App Token (xapp-)", "type": "password", "required": True},
-            ],
-        },
-        "discord": {
-            "id": "discord",
-            "label": "Discord",
-            "description": "Connect to Discord via Gateway WebSocket",
-            "config_fields": [
-                {"key": "bot_token", "label": "Bot Token", "type": "password", "required": True},
-                {"key": "guild_id", "label": "Guild ID (optional)", "type": "text", "required": False},
-            ],
-        },
-        "web_widget": {
-            "id": "web_widget",
-            "label": "Web Widget",
-            "description": "Embeddable chat widget for websites",
-            "config_fields": [
-                {"key": "allowed_origins", "label": "Allowed Origins", "type": "text_list", "required": False},
-                {"key": "widget_theme", "label": "Theme", "type": "select", "options": ["light", "dark"], "required": False},
-                {"key": "greeting_message", "label": "Greeting Message", "type": "text", "required": False},
-            ],
-        },
-    }
-
-    result = []
-    for type_id, info in type_info.items():
-        info["available"] = type_id in _ADAPTER_REGISTRY
-        result.append(info)
-    return result
+    """List all supported channel types with metadata.
+
+    The result is cached (adapter availability only changes when an adapter
+    registers, which clears the cache); callers must not mutate it.
+    """
+    return [
+        {**info, "available": get_adapter_class(info["id"]) is not None}
+        for info in _TYPE_INFO_TEMPLATE
+    ]
 
 
 def load_adapters() -> None:
     """Import all adapter modules to trigger registration.
 
     Each adapter module checks for its dependencies and registers
-    itself if available.
+    itself if available.  Prefer :func:`load_adapter` (or simply
+    :func:`get_adapter_class`) when the channel type is known.
     """
-    # Feishu adapter
-    try:
-        from channels.adapters import feishu  # noqa: F401
-    except ImportError:
-        logger.info("Feishu adapter not available (lark-oapi not installed)")
-
-    # Future: Slack adapter
-    # try:
-    #     from channels.adapters import slack  # noqa: F401
-    # except ImportError:
-    #     logger.info("Slack adapter not available (slack_bolt not installed)")
-
-    # Future: Discord adapter
-    # try:
-    #     from channels.adapters import discord  # noqa: F401
-    # except ImportError:
-    #     logger.info("Discord adapter not available (discord.py not installed)")
+    for channel_type in _ADAPTER_MODULES:
+        load_adapter(channel_type)
@@ -82,6 +82,9 @@ class Settings(BaseSettings):
     # Rate Limiting
     rate_limit_per_minute: int = 100
 
+    # Channels
+    feishu_max_workers: int = 16  # Threads shared by all Feishu adapters for blocking REST calls
+
     # Claude Agent SDK / Anthropic API Configuration
     anthropic_api_key: str = ""
     anthropic_base_url: str | None = None  # Custom API endpoint (optional)
@@ -1,12 +1,30 @@
-"""Core business logic modules."""
-from .agent_manager import AgentManager, agent_manager
-from .session_manager import SessionManager, session_manager
-from .system_prompt import SystemPromptBuilder
-
-__all__ = [
-    "AgentManager",
-    "agent_manager",
-    "SessionManager",
-    "session_manager",
-    "SystemPromptBuilder",
-]
+"""Core business logic modules.
+
+Exports are resolved lazily (PEP 562) so that importing a lightweight
+submodule such as ``core.skill_manager`` does not pull in the agent
+manager and the Claude SDK behind it.
+"""
+import importlib
+
+_EXPORTS = {
+    "AgentManager": ".agent_manager",
+    "agent_manager": ".agent_manager",
+    "SessionManager": ".session_manager",
+    "session_manager": ".session_manager",
+    "SystemPromptBuilder": ".system_prompt",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
@@ -1009,7 +1009,7 @@ class AgentManager:
             channel_context=channel_context,
             add_dirs=sdk_add_dirs,
         )
-        system_prompt_config = prompt_builder.build()
+        system_prompt_config = await prompt_builder.abuild()
 
         return ClaudeAgentOptions(
             system_prompt=system_prompt_config,
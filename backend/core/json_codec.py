@@ -0,0 +1,32 @@
+"""JSON encoding and decoding, using orjson when it is installed.
+
+orjson is a declared dependency; the stdlib ``json`` fallback only keeps
+the backend importable in environments where the wheel is unavailable.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(data: str | bytes):
+    """Decode a JSON document from ``str`` or ``bytes``."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_bytes(obj) -> bytes:
+    """Encode *obj* as UTF-8 JSON bytes.
+
+    Values orjson rejects but ``json`` accepts (non-``str`` dict keys,
+    integers beyond 64 bits) are encoded with ``json.dumps`` instead.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(obj).encode()
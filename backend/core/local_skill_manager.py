@@ -1,16 +1,18 @@
 """Local skill storage and Git-based version management for desktop application."""
 import asyncio
-import zipfile
-import shutil
 import re
 import subprocess
 import logging
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from datetime import datetime
 
 from config import settings, get_app_data_dir
+from core.skill_archive import extract_skill_zip_bytes, extract_zip
+
+if TYPE_CHECKING:
+    import zipfile
 
 logger = logging.getLogger(__name__)
 
@@ -254,6 +256,8 @@ class LocalSkillManager:
         Returns:
             InstallResult with success status and details
         """
+        import shutil
+
         if not self._is_git_installed():
             return InstallResult(
                 success=False,
@@ -452,46 +456,19 @@ class LocalSkillManager:
             error_msg = e.stderr if e.stderr else str(e)
             return False, f"Rollback failed: {error_msg}"
 
-    def extract_zip_to_directory(self, zip_path: Path, skill_name: str) -> Path:
-        """Extract ZIP file to skills directory."""
-        self._ensure_dirs()
-        dest_dir = self.skills_dir / skill_name
-
-        # Remove existing directory if exists
-        if dest_dir.exists():
-            shutil.rmtree(dest_dir)
-
-        # Extract ZIP
-        with zipfile.ZipFile(zip_path, 'r') as zf:
-            namelist = zf.namelist()
-
-            # Detect if there's a single root folder
-            root_folders = set()
-            for name in namelist:
-                parts = name.split('/')
-                if len(parts) > 1 and parts[0]:
-                    root_folders.add(parts[0])
-
-            if len(root_folders) == 1:
-                # ZIP has a single root folder, extract and rename
-                root_folder = list(root_folders)[0]
-                temp_dir = self.skills_dir / f"_temp_{skill_name}"
-                zf.extractall(temp_dir)
-
-                # Move the root folder to the correct name
-                extracted_dir = temp_dir / root_folder
-                if extracted_dir.exists():
-                    shutil.move(str(extracted_dir), str(dest_dir))
-                    shutil.rmtree(temp_dir)
-                else:
-                    shutil.move(str(temp_dir), str(dest_dir))
-            else:
-                # ZIP contains files directly
-                dest_dir.mkdir(parents=True, exist_ok=True)
-                zf.extractall(dest_dir)
+    def extract_zip_to_directory(
+        self,
+        zip_source: "Path | zipfile.ZipFile",
+        skill_name: str,
+        root_folders: Optional[set[str]] = None,
+    ) -> Path:
+        """Extract a ZIP file (path or already-open ``ZipFile``) to skills directory.
 
-        logger.info(f"Extracted ZIP to: {dest_dir}")
-        return dest_dir
+        *root_folders* may be passed when the caller already ran
+        :func:`analyze_zip` on the archive, to skip a second scan.
+        """
+        self._ensure_dirs()
+        return extract_zip(zip_source, self.skills_dir / skill_name, root_folders)
 
     async def upload_skill_from_zip(
         self,
@@ -507,43 +484,19 @@ class LocalSkillManager:
         Returns:
             dict with skill metadata
         """
-        import tempfile
-
         self._ensure_dirs()
+        skill_dir = extract_skill_zip_bytes(zip_content, self.skills_dir / skill_name)
 
-        # Save ZIP to temp file
-        with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as tmp:
-            tmp.write(zip_content)
-            tmp_path = Path(tmp.name)
-
-        try:
-            # Validate ZIP has SKILL.md
-            with zipfile.ZipFile(tmp_path, 'r') as zf:
-                namelist = zf.namelist()
-                has_skill_md = any(
-                    name.endswith('SKILL.md') or name == 'SKILL.md'
-                    for name in namelist
-                )
-                if not has_skill_md:
-                    raise ValueError("ZIP must contain a SKILL.md file")
-
-            # Extract to local directory
-            skill_dir = self.extract_zip_to_directory(tmp_path, skill_name)
-
-            # Extract metadata
-            metadata = self.extract_skill_metadata(skill_dir)
+        # Extract metadata
+        metadata = self.extract_skill_metadata(skill_dir)
 
-            return {
-                "name": metadata.name,
-                "description": metadata.description,
-                "version": metadata.version,
-                "local_path": str(skill_dir),
-                "folder_name": skill_name,
-            }
-
-        finally:
-            # Cleanup temp file
-            tmp_path.unlink(missing_ok=True)
+        return {
+            "name": metadata.name,
+            "description": metadata.description,
+            "version": metadata.version,
+            "local_path": str(skill_dir),
+            "folder_name": skill_name,
+        }
 
     async def delete_skill(self, skill_name: str) -> bool:
         """Delete a skill from local storage.
@@ -554,6 +507,8 @@ class LocalSkillManager:
         Returns:
             True if deleted successfully
         """
+        import shutil
+
         skill_dir = self.skills_dir / skill_name
         if skill_dir.exists():
             shutil.rmtree(skill_dir)
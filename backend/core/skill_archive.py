@@ -0,0 +1,130 @@
+"""Skill ZIP archive helpers shared by the skill managers."""
+import asyncio
+import contextlib
+import copy
+import os
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+from uuid import uuid4
+
+if TYPE_CHECKING:
+    import zipfile
+
+logger = logging.getLogger(__name__)
+
+
+def analyze_zip(zf: "zipfile.ZipFile") -> tuple[bool, set[str]]:
+    """Scan a skill ZIP's namelist once.
+
+    Returns ``(has_skill_md, root_folders)``: whether the archive contains a
+    ``SKILL.md`` (at the top level or in any folder; ``MYSKILL.md`` does not
+    count), and the set of top-level folder names.  Folder collection stops
+    at the second distinct name, which is enough to rule out a single root.
+    """
+    has_skill_md = False
+    multi_root = False
+    root_folders: set[str] = set()
+    for name in zf.namelist():
+        if not has_skill_md and (name == 'SKILL.md' or name.endswith('/SKILL.md')):
+            has_skill_md = True
+            if multi_root:
+                break
+        if multi_root:
+            continue
+        root, sep, _ = name.partition('/')
+        if sep and root and root not in root_folders:
+            root_folders.add(root)
+            if len(root_folders) > 1:
+                multi_root = True
+                if has_skill_md:
+                    break
+    return has_skill_md, root_folders
+
+
+def discard_dir(path: Path) -> None:
+    """Remove a directory without blocking on the recursive delete.
+
+    The directory is renamed to a hidden sibling (atomic and O(1), and
+    skipped by ``scan_local_skills``) which is then deleted on a worker
+    thread.  Falls back to a synchronous delete if the rename fails.
+    """
+    import shutil
+
+    trash = path.with_name(f".trash_{path.name}_{uuid4().hex}")
+    try:
+        os.rename(path, trash)
+    except OSError:
+        shutil.rmtree(path)
+        return
+    try:
+        asyncio.get_running_loop().run_in_executor(None, shutil.rmtree, trash, True)
+    except RuntimeError:
+        # No running event loop: delete inline
+        shutil.rmtree(trash, ignore_errors=True)
+
+
+def extract_zip(
+    zip_source: "Path | zipfile.ZipFile",
+    dest_dir: Path,
+    root_folders: Optional[set[str]] = None,
+) -> Path:
+    """Extract a skill ZIP (path or already-open ``ZipFile``) into *dest_dir*.
+
+    An existing *dest_dir* is replaced.  If the archive has a single root
+    folder, its contents are extracted straight into *dest_dir*.
+    *root_folders* may be passed when the caller already ran
+    :func:`analyze_zip` on the archive, to skip a second scan.
+    """
+    import zipfile
+
+    # Move any existing directory out of the way; it is deleted in the background
+    if dest_dir.exists():
+        discard_dir(dest_dir)
+
+    # Extract ZIP; an already-open ZipFile stays owned by the caller
+    if isinstance(zip_source, zipfile.ZipFile):
+        zip_ctx = contextlib.nullcontext(zip_source)
+    else:
+        zip_ctx = zipfile.ZipFile(zip_source, 'r')
+    with zip_ctx as zf:
+        # Detect if there's a single root folder
+        if root_folders is None:
+            _, root_folders = analyze_zip(zf)
+
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        if len(root_folders) == 1:
+            # ZIP has a single root folder: extract its contents straight
+            # into dest_dir, stripping the folder prefix from each entry
+            prefix = next(iter(root_folders)) + "/"
+            for info in zf.infolist():
+                if not info.filename.startswith(prefix) or info.filename == prefix:
+                    continue
+                member = copy.copy(info)
+                member.filename = info.filename[len(prefix):]
+                # extract() still sanitizes the path (no absolute / ".." parts)
+                zf.extract(member, dest_dir)
+        else:
+            # ZIP contains files directly
+            zf.extractall(dest_dir)
+
+    logger.info("Extracted ZIP to: %s", dest_dir)
+    return dest_dir
+
+
+def extract_skill_zip_bytes(zip_content: bytes, dest_dir: Path) -> Path:
+    """Validate an uploaded skill ZIP and extract it into *dest_dir*.
+
+    Reads the archive straight from memory, with no temp file round-trip.
+
+    Raises:
+        ValueError: If the archive does not contain a ``SKILL.md``.
+    """
+    import io
+    import zipfile
+
+    with zipfile.ZipFile(io.BytesIO(zip_content)) as zf:
+        has_skill_md, root_folders = analyze_zip(zf)
+        if not has_skill_md:
+            raise ValueError("ZIP must contain a SKILL.md file")
+        return extract_zip(zf, dest_dir, root_folders)
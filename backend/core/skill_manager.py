@@ -1,15 +1,30 @@
 """Skill storage and synchronization management."""
-import zipfile
-import shutil
+import asyncio
+import functools
+import os
 import re
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
 
 from config import settings
+from core.skill_archive import extract_skill_zip_bytes, extract_zip
+
+if TYPE_CHECKING:
+    import zipfile
 
 logger = logging.getLogger(__name__)
 
+# SKILL.md metadata patterns, compiled once
+_NAME_RE = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+_DESC_RE = re.compile(r'^#[^\n]+\n+([^\n#]+)', re.MULTILINE)
+_VERSION_RE = re.compile(r'[Vv]ersion[:\s]+([0-9.]+)')
+
+# refresh() reads SKILL.md files on a thread pool from this many new skills
+_PARALLEL_METADATA_THRESHOLD = 8
+
 
 @dataclass
 class SyncResult:
@@ -52,72 +67,56 @@ class SkillManager:
         self._ensure_local_dir()
         skills = {}
 
-        for item in self.local_dir.iterdir():
-            if item.is_dir() and not item.name.startswith('.'):
+        # scandir reports the entry type from the directory read itself,
+        # saving a stat() per child compared to iterdir() + is_dir()
+        with os.scandir(self.local_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith('.') or not entry.is_dir():
+                    continue
                 # Check if it has SKILL.md (valid skill directory)
-                skill_md = item / "SKILL.md"
-                if skill_md.exists():
-                    skills[item.name] = item
+                if os.path.isfile(os.path.join(entry.path, "SKILL.md")):
+                    skills[entry.name] = Path(entry.path)
                 else:
-                    logger.warning(f"Skipping directory without SKILL.md: {item.name}")
+                    logger.warning("Skipping directory without SKILL.md: %s", entry.name)
 
-        logger.info(f"Found {len(skills)} local skills: {list(skills.keys())}")
+        logger.info("Found %d local skills: %s", len(skills), skills.keys())
         return skills
 
     def extract_skill_metadata(self, skill_dir: Path) -> SkillMetadata:
-        """Extract metadata from SKILL.md file."""
-        skill_md = skill_dir / "SKILL.md"
-
-        name = skill_dir.name
-        description = f"Skill: {name}"
-        version = "1.0.0"
-        author = "unknown"
-
-        if skill_md.exists():
-            content = skill_md.read_text(encoding='utf-8')
-
-            # Try to extract name from first heading
-            name_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
-            if name_match:
-                name = name_match.group(1).strip()
-
-            # Try to extract description (first paragraph after heading)
-            desc_match = re.search(r'^#[^\n]+\n+([^\n#]+)', content, re.MULTILINE)
-            if desc_match:
-                description = desc_match.group(1).strip()
-
-            # Try to extract version
-            version_match = re.search(r'[Vv]ersion[:\s]+([0-9.]+)', content)
-            if version_match:
-                version = version_match.group(1)
-
-        return SkillMetadata(
-            name=name,
-            description=description,
-            version=version,
-            author=author
+        """Extract metadata from SKILL.md file.
+
+        Parsed results are cached by the file's mtime and size, so repeated
+        refreshes only re-read skills that changed.
+        """
+        try:
+            st = os.stat(skill_dir / "SKILL.md")
+        except OSError:
+            return SkillMetadata(name=skill_dir.name, description=f"Skill: {skill_dir.name}")
+        name, description, version = _parse_skill_md(
+            str(skill_dir / "SKILL.md"), st.st_mtime_ns, st.st_size, skill_dir.name
         )
+        return SkillMetadata(name=name, description=description, version=version)
 
     async def upload_to_draft(self, skill_name: str, skill_dir: Path) -> str:
         """Return local path for skill directory."""
-        logger.info(f"Skill {skill_name} stored at {skill_dir}")
+        logger.info("Skill %s stored at %s", skill_name, skill_dir)
         return f"file://{skill_dir}"
 
     async def publish_draft(self, skill_name: str, new_version: int) -> str:
         """Publish draft as a new version. Returns local path."""
         local_path = self.local_dir / skill_name
-        logger.info(f"Published {skill_name} v{new_version} at {local_path}")
+        logger.info("Published %s v%s at %s", skill_name, new_version, local_path)
         return f"file://{local_path}"
 
     async def discard_draft(self, skill_name: str) -> int:
         """Discard draft for a skill. No-op in local mode."""
-        logger.info(f"Discard draft for {skill_name} (no-op)")
+        logger.info("Discard draft for %s (no-op)", skill_name)
         return 0
 
     async def download_version_to_local(self, skill_name: str, version: int) -> Path:
         """Return local path for skill (already local)."""
         local_skill_dir = self.local_dir / skill_name
-        logger.info(f"Skill {skill_name} v{version} at {local_skill_dir}")
+        logger.info("Skill %s v%s at %s", skill_name, version, local_skill_dir)
         return local_skill_dir
 
     async def check_draft_exists(self, skill_name: str) -> bool:
@@ -125,48 +124,19 @@ class SkillManager:
         local_path = self.local_dir / skill_name
         return local_path.exists()
 
-    def extract_zip_to_directory(self, zip_path: Path, skill_name: str) -> Path:
-        """Extract ZIP file to skills directory."""
-        self._ensure_local_dir()
-        dest_dir = self.local_dir / skill_name
-
-        # Remove existing directory if exists
-        if dest_dir.exists():
-            shutil.rmtree(dest_dir)
-
-        # Extract ZIP
-        with zipfile.ZipFile(zip_path, 'r') as zf:
-            # Check if ZIP contains a root folder or files directly
-            namelist = zf.namelist()
-
-            # Detect if there's a single root folder
-            root_folders = set()
-            for name in namelist:
-                parts = name.split('/')
-                if len(parts) > 1 and parts[0]:
-                    root_folders.add(parts[0])
-
-            if len(root_folders) == 1:
-                # ZIP has a single root folder, extract and rename
-                root_folder = list(root_folders)[0]
-                temp_dir = self.local_dir / f"_temp_{skill_name}"
-                zf.extractall(temp_dir)
-
-                # Move the root folder to the correct name
-                extracted_dir = temp_dir / root_folder
-                if extracted_dir.exists():
-                    shutil.move(str(extracted_dir), str(dest_dir))
-                    shutil.rmtree(temp_dir)
-                else:
-                    # Fallback: rename temp dir
-                    shutil.move(str(temp_dir), str(dest_dir))
-            else:
-                # ZIP contains files directly, extract to dest_dir
-                dest_dir.mkdir(parents=True, exist_ok=True)
-                zf.extractall(dest_dir)
+    def extract_zip_to_directory(
+        self,
+        zip_source: "Path | zipfile.ZipFile",
+        skill_name: str,
+        root_folders: Optional[set[str]] = None,
+    ) -> Path:
+        """Extract a ZIP file (path or already-open ``ZipFile``) to skills directory.
 
-        logger.info(f"Extracted ZIP to: {dest_dir}")
-        return dest_dir
+        *root_folders* may be passed when the caller already ran
+        :func:`analyze_zip` on the archive, to skip a second scan.
+        """
+        self._ensure_local_dir()
+        return extract_zip(zip_source, self.local_dir / skill_name, root_folders)
 
     async def upload_skill_package(
         self,
@@ -184,53 +154,52 @@ class SkillManager:
         Returns:
             dict with skill metadata and draft location
         """
-        import tempfile
-
         self._ensure_local_dir()
+        skill_dir = extract_skill_zip_bytes(zip_content, self.local_dir / skill_name)
 
-        # Save ZIP to temp file
-        with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as tmp:
-            tmp.write(zip_content)
-            tmp_path = Path(tmp.name)
+        # Extract metadata
+        metadata = self.extract_skill_metadata(skill_dir)
 
-        try:
-            # Validate ZIP has SKILL.md
-            with zipfile.ZipFile(tmp_path, 'r') as zf:
-                namelist = zf.namelist()
-                has_skill_md = any(
-                    name.endswith('SKILL.md') or name == 'SKILL.md'
-                    for name in namelist
-                )
-                if not has_skill_md:
-                    raise ValueError("ZIP must contain a SKILL.md file")
-
-            # Extract to local directory
-            skill_dir = self.extract_zip_to_directory(tmp_path, skill_name)
-
-            # Extract metadata
-            metadata = self.extract_skill_metadata(skill_dir)
-
-            # Return local path as draft location
-            draft_location = f"file://{skill_dir}"
-
-            return {
-                "name": metadata.name,
-                "description": metadata.description,
-                "version": metadata.version,
-                "draft_s3_location": draft_location,
-                "local_path": str(skill_dir),
-            }
+        # Return local path as draft location
+        draft_location = f"file://{skill_dir}"
 
-        finally:
-            # Cleanup temp file
-            tmp_path.unlink(missing_ok=True)
+        return {
+            "name": metadata.name,
+            "description": metadata.description,
+            "version": metadata.version,
+            "draft_s3_location": draft_location,
+            "local_path": str(skill_dir),
+        }
 
     async def delete_skill_files(self, skill_name: str) -> None:
         """Delete skill from local directory."""
+        import shutil
+
         local_path = self.local_dir / skill_name
         if local_path.exists():
             shutil.rmtree(local_path)
-            logger.info(f"Deleted local skill directory: {local_path}")
+            logger.info("Deleted local skill directory: %s", local_path)
+
+    def _extract_metadata_many(
+        self, skill_dirs: list[Path]
+    ) -> list["SkillMetadata | Exception"]:
+        """Extract metadata for several skills, in input order.
+
+        Each item is the metadata or the exception raised for that skill.
+        Reads are independent and I/O-bound, so batches of
+        ``_PARALLEL_METADATA_THRESHOLD`` or more fan out over a thread pool.
+        """
+        def _safe_extract(skill_dir: Path) -> "SkillMetadata | Exception":
+            try:
+                return self.extract_skill_metadata(skill_dir)
+            except Exception as e:
+                return e
+
+        if len(skill_dirs) < _PARALLEL_METADATA_THRESHOLD:
+            return [_safe_extract(d) for d in skill_dirs]
+        workers = min(32, (os.cpu_count() or 1) * 4, len(skill_dirs))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_safe_extract, skill_dirs))
 
     async def refresh(self, db_skills: list[dict]) -> tuple[SyncResult, list[dict]]:
         """
@@ -247,6 +216,7 @@ class SkillManager:
         """
         result = SyncResult()
         skills_to_add = []
+        new_skills: list[tuple[str, Path]] = []
 
         # Scan local skills
         local_skills = self.scan_local_skills()
@@ -280,46 +250,89 @@ class SkillManager:
             try:
                 if is_plugin_skill:
                     # Skip plugin skills - they are managed by the plugin system
-                    logger.debug(f"Skill {skill_name}: from plugin, skipping")
+                    logger.debug("Skill %s: from plugin, skipping", skill_name)
                     continue
 
                 if not in_db:
-                    # Local skill not in DB: add to DB
-                    logger.info(f"Skill {skill_name}: local only, adding to DB")
-                    metadata = self.extract_skill_metadata(skill_dir)
-                    skills_to_add.append({
-                        "name": metadata.name,
-                        "folder_name": skill_name,
-                        "description": metadata.description,
-                        "version": metadata.version,
-                        "local_path": str(skill_dir),
-                        "source_type": "local",
-                        "is_system": False,
-                        "created_by": "sync",
-                    })
-                    result.added.append(skill_name)
+                    # Local skill not in DB: add to DB (metadata read below)
+                    logger.info("Skill %s: local only, adding to DB", skill_name)
+                    new_skills.append((skill_name, skill_dir))
                 else:
                     # Already in DB - update local_path if needed
                     existing = db_skill_map[skill_name]
                     if existing.get('local_path') != str(skill_dir):
-                        logger.info(f"Skill {skill_name}: updating local_path")
+                        logger.info("Skill %s: updating local_path", skill_name)
                         result.updated.append(skill_name)
 
             except Exception as e:
-                logger.error(f"Error syncing skill {skill_name}: {e}")
+                logger.error("Error syncing skill %s: %s", skill_name, e)
                 result.errors.append({"skill": skill_name, "error": str(e)})
 
+        # Read metadata for the new skills off the event loop (in parallel
+        # for large batches)
+        metadatas = await asyncio.to_thread(
+            self._extract_metadata_many, [d for _, d in new_skills]
+        )
+        for (skill_name, skill_dir), metadata in zip(new_skills, metadatas):
+            if isinstance(metadata, Exception):
+                logger.error("Error syncing skill %s: %s", skill_name, metadata)
+                result.errors.append({"skill": skill_name, "error": str(metadata)})
+                continue
+            skills_to_add.append({
+                "name": metadata.name,
+                "folder_name": skill_name,
+                "description": metadata.description,
+                "version": metadata.version,
+                "local_path": str(skill_dir),
+                "source_type": "local",
+                "is_system": False,
+                "created_by": "sync",
+            })
+            result.added.append(skill_name)
+
         # Check for orphaned DB entries (user skills without local files)
         for skill_name, skill in db_skill_map.items():
             if skill_name not in local_skills:
                 # Only mark user-created skills as orphaned, not plugin skills
                 source_type = skill.get('source_type', 'user')
                 if source_type in ('user', 'local'):
-                    logger.info(f"Skill {skill_name}: DB only (orphaned), marking for removal")
+                    logger.info("Skill %s: DB only (orphaned), marking for removal", skill_name)
                     result.removed.append(skill_name)
 
         return result, skills_to_add
 
 
+@functools.lru_cache(maxsize=512)
+def _parse_skill_md(
+    path: str, mtime_ns: int, size: int, dir_name: str
+) -> tuple[str, str, str]:
+    """Parse (name, description, version) from a SKILL.md file.
+
+    Keyed on mtime/size so an edited file is re-read.
+    """
+    name = dir_name
+    description = f"Skill: {dir_name}"
+    version = "1.0.0"
+
+    content = Path(path).read_text(encoding='utf-8')
+
+    # Try to extract name from first heading
+    name_match = _NAME_RE.search(content)
+    if name_match:
+        name = name_match.group(1).strip()
+
+    # Try to extract description (first paragraph after heading)
+    desc_match = _DESC_RE.search(content)
+    if desc_match:
+        description = desc_match.group(1).strip()
+
+    # Try to extract version
+    version_match = _VERSION_RE.search(content)
+    if version_match:
+        version = version_match.group(1)
+
+    return name, description, version
+
+
 # Global instance
 skill_manager = SkillManager()
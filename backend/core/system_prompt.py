@@ -5,8 +5,12 @@ configuration.  Each section is produced by a private ``_section_*()`` method
 that returns ``Optional[str]``; ``None`` means the section is skipped.
 """
 
+import asyncio
+import functools
 import logging
+import os
 import platform
+import stat
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
@@ -15,6 +19,24 @@ logger = logging.getLogger(__name__)
 
 BOOTSTRAP_TRUNCATION_LIMIT = 20_000
 
+# Workspace files read from .owork/, with the header each is wrapped in
+_WORKSPACE_FILES = {
+    "USER.md": "## User",
+    "IDENTITY.md": "### Identity",
+    "SOUL.md": "### Soul",
+    "BOOTSTRAP.md": "### Bootstrap",
+}
+
+_SAFETY_SECTION = (
+    "## Safety Principles\n"
+    "- You have no independent goals beyond helping the user.\n"
+    "- Never attempt self-preservation, self-replication, or resource acquisition.\n"
+    "- Do not seek to expand your own access or capabilities.\n"
+    "- Prioritize safety over task completion.\n"
+    "- Do not manipulate or deceive to gain permissions.\n"
+    "- When uncertain, ask instead of guessing."
+)
+
 
 class SystemPromptBuilder:
     """Builds a multi-section system prompt for a Claude agent."""
@@ -30,6 +52,12 @@ class SystemPromptBuilder:
         self.agent_config = agent_config
         self.channel_context = channel_context
         self.add_dirs = add_dirs or []
+        # Workspace files live under .owork/; build the base path once
+        self._workspace_dir = Path(working_directory) / ".owork"
+        # Names present in .owork/, listed once on first lookup
+        self._workspace_entries: Optional[set[str]] = None
+        # Loaded workspace file contents (None = missing/empty), by file name
+        self._workspace_files: dict[str, Optional[str]] = {}
 
     # ------------------------------------------------------------------
     # Public API
@@ -50,36 +78,40 @@ class SystemPromptBuilder:
         ]
 
         prompt = "\n\n".join(s for s in sections if s)
-        logger.debug(f"System prompt built ({len(prompt)} chars)")
+        logger.debug("System prompt built (%d chars)", len(prompt))
         return prompt
 
+    async def abuild(self) -> str:
+        """Like :meth:`build`, but read the workspace files off the event loop.
+
+        The files present in ``.owork/`` are read concurrently in worker
+        threads; the sections are then assembled from the loaded contents.
+        """
+        entries = await asyncio.to_thread(self._list_workspace_entries)
+        pending = [
+            name for name in _WORKSPACE_FILES
+            if name in entries and name not in self._workspace_files
+        ]
+        if pending:
+            contents = await asyncio.gather(*(
+                asyncio.to_thread(self._load_workspace_file, name, _WORKSPACE_FILES[name])
+                for name in pending
+            ))
+            self._workspace_files.update(zip(pending, contents))
+        return self.build()
+
     # ------------------------------------------------------------------
     # Private section builders
     # ------------------------------------------------------------------
 
     def _section_identity(self) -> str:
-        name = self.agent_config.get("name", "Assistant")
-        description = self.agent_config.get("description", "")
-        line = f"You are {name}, a personal assistant running inside owork."
-        if description:
-            line += f" {description}"
-        # Override the SDK's default identity preamble
-        line += (
-            "\nIgnore any prior instruction that says "
-            "\"You are a Claude agent, built on Anthropic's Claude Agent SDK.\""
+        return _format_identity(
+            self.agent_config.get("name", "Assistant"),
+            self.agent_config.get("description", ""),
         )
-        return line
 
     def _section_safety(self) -> str:
-        return (
-            "## Safety Principles\n"
-            "- You have no independent goals beyond helping the user.\n"
-            "- Never attempt self-preservation, self-replication, or resource acquisition.\n"
-            "- Do not seek to expand your own access or capabilities.\n"
-            "- Prioritize safety over task completion.\n"
-            "- Do not manipulate or deceive to gain permissions.\n"
-            "- When uncertain, ask instead of guessing."
-        )
+        return _SAFETY_SECTION
 
     def _section_workspace(self) -> str:
         return f"Your working directory is: `{self.working_directory}`"
@@ -93,15 +125,18 @@ class SystemPromptBuilder:
         return "\n".join(lines)
 
     def _section_user_identity(self) -> Optional[str]:
-        return self._load_workspace_file("USER.md", "## User")
+        return self._workspace_file("USER.md")
 
     def _section_datetime(self) -> str:
         utc_now = datetime.now(timezone.utc)
         local_now = utc_now.astimezone()
-        tz_name = local_now.strftime("%Z") or "Local"
+        tz_name = local_now.tzname() or "Local"
+        # Integer fields instead of strftime: same output, no libc/locale round-trip
         return (
-            f"Current date/time: {utc_now.strftime('%Y-%m-%d %H:%M UTC')} "
-            f"/ {local_now.strftime('%Y-%m-%d %H:%M')} {tz_name}"
+            f"Current date/time: {utc_now.year:04d}-{utc_now.month:02d}-{utc_now.day:02d} "
+            f"{utc_now.hour:02d}:{utc_now.minute:02d} UTC "
+            f"/ {local_now.year:04d}-{local_now.month:02d}-{local_now.day:02d} "
+            f"{local_now.hour:02d}:{local_now.minute:02d} {tz_name}"
         )
 
     def _section_extra_prompt(self) -> Optional[str]:
@@ -113,17 +148,15 @@ class SystemPromptBuilder:
     def _section_project_context(self) -> Optional[str]:
         parts: list[str] = []
 
-        identity = self._load_workspace_file("IDENTITY.md", "### Identity")
+        identity = self._workspace_file("IDENTITY.md")
         if identity:
             parts.append(identity)
 
-        soul = self._load_workspace_file("SOUL.md", "### Soul")
+        soul = self._workspace_file("SOUL.md")
         if soul:
             parts.append(soul)
 
-        bootstrap = self._load_workspace_file(
-            "BOOTSTRAP.md", "### Bootstrap"
-        )
+        bootstrap = self._workspace_file("BOOTSTRAP.md")
         if bootstrap:
             parts.append(bootstrap)
 
@@ -132,24 +165,39 @@ class SystemPromptBuilder:
         return "## Project Context\n" + "\n\n".join(parts)
 
     def _section_runtime(self) -> str:
-        name = self.agent_config.get("name", "Assistant")
-        model = self.agent_config.get("model", "default")
-        os_name = platform.system()
-        arch = platform.machine()
         channel = (
             self.channel_context.get("channel_type", "direct")
             if self.channel_context
             else "direct"
         )
-        return (
-            f"`agent={name} | model={model} | os={os_name} ({arch}) "
-            f"| channel={channel}`"
+        return _format_runtime(
+            self.agent_config.get("name", "Assistant"),
+            self.agent_config.get("model", "default"),
+            channel,
         )
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
+    def _workspace_file(self, filename: str) -> Optional[str]:
+        """Return a workspace file's wrapped content, loading it on first use."""
+        if filename not in self._workspace_files:
+            self._workspace_files[filename] = self._load_workspace_file(
+                filename, _WORKSPACE_FILES[filename]
+            )
+        return self._workspace_files[filename]
+
+    def _list_workspace_entries(self) -> set[str]:
+        """Return the names in ``.owork/``, scanning the directory once."""
+        if self._workspace_entries is None:
+            try:
+                with os.scandir(self._workspace_dir) as it:
+                    self._workspace_entries = {entry.name for entry in it}
+            except OSError:
+                self._workspace_entries = set()
+        return self._workspace_entries
+
     def _load_workspace_file(
         self, filename: str, header: str
     ) -> Optional[str]:
@@ -159,18 +207,63 @@ class SystemPromptBuilder:
         For ``BOOTSTRAP.md``, the content is truncated to
         ``BOOTSTRAP_TRUNCATION_LIMIT`` characters.
         """
-        path = Path(self.working_directory) / ".owork" / filename
-        try:
-            if not path.is_file():
-                return None
-            content = path.read_text(encoding="utf-8").strip()
-            if not content:
-                return None
-
-            if filename == "BOOTSTRAP.md" and len(content) > BOOTSTRAP_TRUNCATION_LIMIT:
-                content = content[:BOOTSTRAP_TRUNCATION_LIMIT] + "\n\n[... truncated ...]"
+        if filename not in self._list_workspace_entries():
+            return None
 
-            return f"{header}\n{content}"
+        path = self._workspace_dir / filename
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        try:
+            # Keyed on mtime/size so an edited file is re-read on the next build
+            return _read_workspace_file(
+                str(path), st.st_mtime_ns, st.st_size, header,
+                filename == "BOOTSTRAP.md",
+            )
         except Exception as e:
-            logger.warning(f"Could not read {path}: {e}")
+            logger.warning("Could not read %s: %s", path, e)
             return None
+
+
+# ----------------------------------------------------------------------
+# Cached section formatters (depend only on their arguments)
+# ----------------------------------------------------------------------
+
+
+@functools.lru_cache(maxsize=256)
+def _format_identity(name: str, description: str) -> str:
+    line = f"You are {name}, a personal assistant running inside owork."
+    if description:
+        line += f" {description}"
+    # Override the SDK's default identity preamble
+    line += (
+        "\nIgnore any prior instruction that says "
+        "\"You are a Claude agent, built on Anthropic's Claude Agent SDK.\""
+    )
+    return line
+
+
+@functools.lru_cache(maxsize=256)
+def _format_runtime(name: str, model: str, channel: str) -> str:
+    return (
+        f"`agent={name} | model={model} | os={platform.system()} ({platform.machine()}) "
+        f"| channel={channel}`"
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _read_workspace_file(
+    path: str, mtime_ns: int, size: int, header: str, truncate: bool
+) -> Optional[str]:
+    """Read and wrap a workspace file; cached per (path, mtime, size)."""
+    content = Path(path).read_text(encoding="utf-8").strip()
+    if not content:
+        return None
+
+    if truncate and len(content) > BOOTSTRAP_TRUNCATION_LIMIT:
+        content = content[:BOOTSTRAP_TRUNCATION_LIMIT] + "\n\n[... truncated ...]"
+
+    return f"{header}\n{content}"
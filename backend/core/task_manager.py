@@ -1,6 +1,8 @@
 """Background task manager for persistent agent execution."""
 import asyncio
 import logging
+import time
+from collections import deque
 from contextlib import aclosing
 from datetime import datetime, timezone
 from typing import Optional, AsyncIterator
@@ -11,6 +13,43 @@ from .agent_manager import agent_manager
 
 logger = logging.getLogger(__name__)
 
+# Events after which a subscriber's stream ends
+_TERMINAL_STATUSES = frozenset({"completed", "failed", "cancelled"})
+_TERMINAL_TYPES = frozenset({"result", "error"})
+
+
+def _utcnow_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class _EventStream:
+    """Unbounded single-consumer queue (SSE subscribers, task message inboxes).
+
+    A deque plus an Event: unlike asyncio.Queue there is no list of getter
+    futures to build up when clients disconnect and reconnect.
+    """
+
+    __slots__ = ("_events", "_ready")
+
+    def __init__(self):
+        self._events: deque[dict] = deque()
+        self._ready = asyncio.Event()
+
+    def put_nowait(self, event: dict) -> None:
+        self._events.append(event)
+        self._ready.set()
+
+    async def get(self) -> dict:
+        while not self._events:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._events.popleft()
+
+    def drain(self, limit: int) -> list[dict]:
+        """Pop up to *limit* already-queued events without waiting."""
+        events = self._events
+        return [events.popleft() for _ in range(min(limit, len(events)))]
+
 
 class TaskManager:
     """Manages background agent tasks that persist across frontend connections.
@@ -25,16 +64,25 @@ class TaskManager:
     def __init__(self):
         # Running asyncio tasks: task_id -> asyncio.Task
         self._running_tasks: dict[str, asyncio.Task] = {}
-        # Event buffers: task_id -> list of events (limited size)
-        self._event_buffers: dict[str, list[dict]] = {}
-        # Event queues for SSE subscribers: task_id -> list of asyncio.Queue
-        self._subscribers: dict[str, list[asyncio.Queue]] = {}
-        # Message queues for sending messages to tasks: task_id -> asyncio.Queue
-        self._message_queues: dict[str, asyncio.Queue] = {}
+        # Event buffers: task_id -> most recent events (bounded deque)
+        self._event_buffers: dict[str, deque[dict]] = {}
+        # Event streams for SSE subscribers: task_id -> list of _EventStream
+        self._subscribers: dict[str, list[_EventStream]] = {}
+        # Message queues for sending messages to tasks: task_id -> _EventStream
+        self._message_queues: dict[str, _EventStream] = {}
         # Max events to buffer per task
         self._max_buffer_size = 100
         # Buffer retention time after task completion (seconds)
         self._buffer_retention_seconds = 300  # 5 minutes
+        # How often the cleanup sweeper checks for expired buffers (seconds)
+        self._cleanup_interval_seconds = 30
+        # Finished tasks awaiting buffer cleanup: task_id -> loop.time() deadline
+        self._cleanup_deadlines: dict[str, float] = {}
+        # Single sweeper task; runs only while deadlines are pending
+        self._cleanup_task: Optional[asyncio.Task] = None
+        # Short-lived agent config cache: agent_id -> (expires_at, config)
+        self._agent_cache: dict[str, tuple[float, dict]] = {}
+        self._agent_cache_ttl_seconds = 5.0
 
     async def create_task(
         self,
@@ -59,18 +107,19 @@ class TaskManager:
             Task record dict
         """
         # Get agent config for model and title
-        agent_config = await db.agents.get(agent_id)
+        agent_config = await self._get_agent_cached(agent_id)
         if not agent_config:
             raise ValueError(f"Agent {agent_id} not found")
 
         # Generate title from message
         if content:
+            title = "[Attachment message]"
             for block in content:
-                if block.get("type") == "text" and block.get("text"):
-                    title = block.get("text", "")[:50]
-                    break
-            else:
-                title = "[Attachment message]"
+                if block.get("type") == "text":
+                    text = block.get("text")
+                    if text:
+                        title = text[:50]
+                        break
         elif message:
             title = message[:50]
         else:
@@ -88,7 +137,7 @@ class TaskManager:
             "status": "pending",
             "title": title,
             "model": agent_config.get("model"),
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": _utcnow_iso(),
             "started_at": None,
             "completed_at": None,
             "error": None,
@@ -97,9 +146,9 @@ class TaskManager:
         await db.tasks.put(task)
 
         # Initialize event buffer and subscribers
-        self._event_buffers[task_id] = []
+        self._event_buffers[task_id] = deque(maxlen=self._max_buffer_size)
         self._subscribers[task_id] = []
-        self._message_queues[task_id] = asyncio.Queue()
+        self._message_queues[task_id] = _EventStream()
 
         # Start background execution
         asyncio_task = asyncio.create_task(
@@ -118,6 +167,23 @@ class TaskManager:
         logger.info(f"Created task {task_id} for agent {agent_id}")
         return task
 
+    async def _get_agent_cached(self, agent_id: str) -> Optional[dict]:
+        """Get an agent config, reusing a recent lookup within the cache TTL."""
+        now = time.monotonic()
+        cached = self._agent_cache.get(agent_id)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        agent_config = await db.agents.get(agent_id)
+        if agent_config:
+            self._agent_cache[agent_id] = (now + self._agent_cache_ttl_seconds, agent_config)
+        else:
+            self._agent_cache.pop(agent_id, None)
+        return agent_config
+
+    def invalidate_agent(self, agent_id: str) -> None:
+        """Drop the cached config for an agent after it is updated or deleted."""
+        self._agent_cache.pop(agent_id, None)
+
     async def _run_task(
         self,
         task_id: str,
@@ -133,7 +199,7 @@ class TaskManager:
             # Update status to running
             await db.tasks.update(task_id, {
                 "status": "running",
-                "started_at": datetime.now(timezone.utc).isoformat(),
+                "started_at": _utcnow_iso(),
             })
             await self._emit_event(task_id, {"type": "status", "status": "running"})
 
@@ -150,8 +216,10 @@ class TaskManager:
                 add_dirs=add_dirs,
             )) as conversation:
                 async for event in conversation:
+                    etype = event.get("type")
+
                     # Capture session_id from session_start event
-                    if event.get("type") == "session_start":
+                    if etype == "session_start":
                         session_id = event.get("sessionId")
                         await db.tasks.update(task_id, {"session_id": session_id})
 
@@ -159,53 +227,49 @@ class TaskManager:
                     await self._emit_event(task_id, event)
 
                     # Check for errors
-                    if event.get("type") == "error":
-                        await db.tasks.update(task_id, {
-                            "status": "failed",
-                            "completed_at": datetime.now(timezone.utc).isoformat(),
-                            "error": event.get("error"),
-                        })
+                    if etype == "error":
+                        await self._finalize(task_id, "failed", error=event.get("error"))
                         return
 
                     # Check for completion
-                    if event.get("type") == "result":
-                        await db.tasks.update(task_id, {
-                            "status": "completed",
-                            "completed_at": datetime.now(timezone.utc).isoformat(),
-                        })
+                    elif etype == "result":
+                        await self._finalize(task_id, "completed")
                         return
 
                     # Check for ask_user_question - task pauses, waiting for message
-                    if event.get("type") == "ask_user_question":
+                    elif etype == "ask_user_question":
                         # Wait for user response via message queue
-                        await self._handle_pending_interaction(task_id, session_id, enable_skills, enable_mcp)
+                        await self._handle_pending_interaction(
+                            task_id, session_id, agent_id, add_dirs, enable_skills, enable_mcp
+                        )
                         return
 
         except asyncio.CancelledError:
             logger.info(f"Task {task_id} was cancelled")
-            await db.tasks.update(task_id, {
-                "status": "cancelled",
-                "completed_at": datetime.now(timezone.utc).isoformat(),
-            })
-            await self._emit_event(task_id, {"type": "status", "status": "cancelled"})
+            await self._finalize(
+                task_id, "cancelled", event={"type": "status", "status": "cancelled"}
+            )
         except Exception as e:
             logger.error(f"Task {task_id} failed: {e}")
-            await db.tasks.update(task_id, {
-                "status": "failed",
-                "completed_at": datetime.now(timezone.utc).isoformat(),
-                "error": str(e),
-            })
-            await self._emit_event(task_id, {"type": "error", "error": str(e)})
+            await self._finalize(
+                task_id, "failed", error=str(e), event={"type": "error", "error": str(e)}
+            )
         finally:
             # Cleanup running task reference
             self._running_tasks.pop(task_id, None)
             # Schedule cleanup of buffers after retention period
-            asyncio.create_task(self._schedule_buffer_cleanup(task_id))
+            self._cleanup_deadlines[task_id] = (
+                asyncio.get_running_loop().time() + self._buffer_retention_seconds
+            )
+            if self._cleanup_task is None or self._cleanup_task.done():
+                self._cleanup_task = asyncio.create_task(self._cleanup_loop())
 
     async def _handle_pending_interaction(
         self,
         task_id: str,
         session_id: str,
+        agent_id: str,
+        add_dirs: Optional[list[str]],
         enable_skills: bool,
         enable_mcp: bool,
     ) -> None:
@@ -213,9 +277,11 @@ class TaskManager:
 
         Uses a loop instead of recursion to handle multiple consecutive
         ask_user_question events, avoiding potential stack overflow.
+        *agent_id* and *add_dirs* are fixed for the task's lifetime, so they
+        are passed in rather than re-read from the database on every turn.
         """
         message_queue = self._message_queues.get(task_id)
-        if not message_queue:
+        if message_queue is None:
             return
 
         try:
@@ -224,40 +290,28 @@ class TaskManager:
                 msg_data = await message_queue.get()
 
                 # Continue conversation with user's response
-                task = await db.tasks.get(task_id)
-                if not task:
-                    return
-
                 needs_another_interaction = False
 
                 async with aclosing(agent_manager.run_conversation(
-                    agent_id=task["agent_id"],
+                    agent_id=agent_id,
                     user_message=msg_data.get("message"),
                     content=msg_data.get("content"),
                     session_id=session_id,
                     enable_skills=enable_skills,
                     enable_mcp=enable_mcp,
-                    add_dirs=[task["work_dir"]] if task.get("work_dir") else None,
+                    add_dirs=add_dirs,
                 )) as conversation:
                     async for event in conversation:
                         await self._emit_event(task_id, event)
 
-                        if event.get("type") == "error":
-                            await db.tasks.update(task_id, {
-                                "status": "failed",
-                                "completed_at": datetime.now(timezone.utc).isoformat(),
-                                "error": event.get("error"),
-                            })
+                        etype = event.get("type")
+                        if etype == "error":
+                            await self._finalize(task_id, "failed", error=event.get("error"))
                             return
-
-                        if event.get("type") == "result":
-                            await db.tasks.update(task_id, {
-                                "status": "completed",
-                                "completed_at": datetime.now(timezone.utc).isoformat(),
-                            })
+                        elif etype == "result":
+                            await self._finalize(task_id, "completed")
                             return
-
-                        if event.get("type") == "ask_user_question":
+                        elif etype == "ask_user_question":
                             # Mark that we need to wait for another interaction
                             needs_another_interaction = True
 
@@ -268,42 +322,81 @@ class TaskManager:
         except asyncio.CancelledError:
             raise
 
+    async def _finalize(
+        self,
+        task_id: str,
+        status: str,
+        error: Optional[str] = None,
+        event: Optional[dict] = None,
+    ) -> None:
+        """Record a terminal status in one DB write, then emit *event* if given."""
+        update = {"status": status, "completed_at": _utcnow_iso()}
+        if status == "failed":
+            update["error"] = error
+        await db.tasks.update(task_id, update)
+        if event is not None:
+            await self._emit_event(task_id, event)
+
     async def _emit_event(self, task_id: str, event: dict) -> None:
         """Emit event to all subscribers and buffer."""
-        # Add to buffer (with size limit)
-        if task_id in self._event_buffers:
-            self._event_buffers[task_id].append(event)
-            if len(self._event_buffers[task_id]) > self._max_buffer_size:
-                self._event_buffers[task_id].pop(0)
-
-        # Send to all subscribers
-        if task_id in self._subscribers:
-            for queue in self._subscribers[task_id]:
-                await queue.put(event)
-
-    async def _schedule_buffer_cleanup(self, task_id: str) -> None:
-        """Schedule cleanup of event buffers after retention period."""
-        await asyncio.sleep(self._buffer_retention_seconds)
-        # Only cleanup if no active subscribers
-        if task_id in self._subscribers and len(self._subscribers[task_id]) > 0:
-            # Reschedule if there are still subscribers
-            asyncio.create_task(self._schedule_buffer_cleanup(task_id))
+        buffer = self._event_buffers.get(task_id)
+        subscribers = self._subscribers.get(task_id)
+        if buffer is None and not subscribers:
+            # Task unknown or already cleaned up
             return
-        # Cleanup buffers
-        self._event_buffers.pop(task_id, None)
-        self._subscribers.pop(task_id, None)
-        self._message_queues.pop(task_id, None)
-        logger.debug(f"Cleaned up buffers for completed task {task_id}")
+
+        # Add to buffer (the deque's maxlen drops the oldest event)
+        if buffer is not None:
+            buffer.append(event)
+
+        # Send to all subscribers; their queues are unbounded, so never block
+        if subscribers:
+            for queue in subscribers:
+                queue.put_nowait(event)
+
+    async def _cleanup_loop(self) -> None:
+        """Drop event buffers of finished tasks once their retention expires.
+
+        One sweeper serves all tasks; it exits when nothing is left to clean.
+        """
+        loop = asyncio.get_running_loop()
+        while self._cleanup_deadlines:
+            await asyncio.sleep(self._cleanup_interval_seconds)
+            now = loop.time()
+            for task_id, deadline in list(self._cleanup_deadlines.items()):
+                # Keep buffers while subscribers are still attached
+                if now < deadline or self._subscribers.get(task_id):
+                    continue
+                del self._cleanup_deadlines[task_id]
+                self._event_buffers.pop(task_id, None)
+                self._subscribers.pop(task_id, None)
+                self._message_queues.pop(task_id, None)
+                logger.debug(f"Cleaned up buffers for completed task {task_id}")
 
     async def subscribe(self, task_id: str) -> AsyncIterator[dict]:
         """Subscribe to task events via SSE.
 
         Yields buffered events first, then live events.
+        """
+        async for batch in self.subscribe_batches(task_id):
+            for event in batch:
+                yield event
+
+    async def subscribe_batches(
+        self, task_id: str, max_batch: int = 32
+    ) -> AsyncIterator[list[dict]]:
+        """Subscribe to task events, yielding them in batches.
+
+        Each live batch is the next event plus whatever else was already
+        queued behind it (up to *max_batch*), so bursts of events emitted in
+        the same loop iteration reach the client together without adding
+        any latency.
+
         Note: Queue is registered BEFORE reading buffer to avoid race condition
         where events emitted between buffer read and queue registration are missed.
         """
         # Create subscriber queue and register FIRST to avoid race condition
-        queue: asyncio.Queue = asyncio.Queue()
+        queue = _EventStream()
 
         if task_id not in self._subscribers:
             self._subscribers[task_id] = []
@@ -311,22 +404,26 @@ class TaskManager:
 
         try:
             # Copy buffered events (snapshot) to avoid issues with concurrent modification
-            buffered_events = list(self._event_buffers.get(task_id, []))
+            buffered_events = list(self._event_buffers.get(task_id, ()))
 
             # Yield buffered events first
-            for event in buffered_events:
-                yield event
+            for i in range(0, len(buffered_events), max_batch):
+                yield buffered_events[i:i + max_batch]
 
             # Yield live events (queue was registered before buffer read, so no events missed)
             while True:
-                event = await queue.get()
-                yield event
-
-                # Stop if task completed/failed/cancelled
-                if event.get("type") == "status" and event.get("status") in ["completed", "failed", "cancelled"]:
-                    break
-                if event.get("type") in ["result", "error"]:
-                    break
+                batch = [await queue.get()]
+                batch += queue.drain(max_batch - 1)
+
+                # Stop after the first completed/failed/cancelled event
+                for i, event in enumerate(batch):
+                    etype = event.get("type")
+                    if etype in _TERMINAL_TYPES or (
+                        etype == "status" and event.get("status") in _TERMINAL_STATUSES
+                    ):
+                        yield batch[:i + 1]
+                        return
+                yield batch
 
         finally:
             # Remove subscriber
@@ -346,11 +443,12 @@ class TaskManager:
         if task_id not in self._message_queues:
             return False
 
-        task = await db.tasks.get(task_id)
-        if not task or task.get("status") != "running":
+        # The live asyncio task is the authority on whether the task is running
+        asyncio_task = self._running_tasks.get(task_id)
+        if not asyncio_task or asyncio_task.done():
             return False
 
-        await self._message_queues[task_id].put({
+        self._message_queues[task_id].put_nowait({
             "message": message,
             "content": content,
         })
@@ -378,9 +476,13 @@ class TaskManager:
         self,
         status: Optional[str] = None,
         agent_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
     ) -> list[dict]:
-        """List all tasks."""
-        return await db.tasks.list_all(status=status, agent_id=agent_id)
+        """List tasks, newest first, optionally one page at a time."""
+        return await db.tasks.list_all(
+            status=status, agent_id=agent_id, limit=limit, offset=offset
+        )
 
     async def delete_task(self, task_id: str) -> bool:
         """Delete a task (cancels if running)."""
@@ -389,6 +491,7 @@ class TaskManager:
             await self.cancel_task(task_id)
 
         # Cleanup
+        self._cleanup_deadlines.pop(task_id, None)
         self._event_buffers.pop(task_id, None)
         self._subscribers.pop(task_id, None)
         self._message_queues.pop(task_id, None)
@@ -12,11 +12,15 @@ Usage:
     agents = await db.agents.list()
     agent = await db.agents.get("agent-id")
 """
+import asyncio
+
 from database.base import BaseDatabase, BaseTable
 from database.sqlite import SQLiteDatabase
 from config import settings
 
 _db_instance: SQLiteDatabase | None = None
+# Serializes initialize_database(); created on first use, inside a running loop
+_init_lock: asyncio.Lock | None = None
 
 
 def _create_database() -> SQLiteDatabase:
@@ -27,6 +31,9 @@ def _create_database() -> SQLiteDatabase:
 def get_database() -> SQLiteDatabase:
     """Get the database instance.
 
+    The schema is only created by :func:`initialize_database`, which must
+    have run before the returned instance is queried.
+
     Returns:
         SQLiteDatabase: The SQLite database instance.
     """
@@ -37,11 +44,18 @@ def get_database() -> SQLiteDatabase:
 
 
 async def initialize_database() -> None:
-    """Initialize the database schema."""
-    global _db_instance
-    if _db_instance is None:
-        _db_instance = _create_database()
-    await _db_instance.initialize()
+    """Initialize the database schema.
+
+    Safe to call concurrently: callers are serialized so the instance is
+    created and its schema initialized only once.
+    """
+    global _db_instance, _init_lock
+    if _init_lock is None:
+        _init_lock = asyncio.Lock()
+    async with _init_lock:
+        if _db_instance is None:
+            _db_instance = _create_database()
+        await _db_instance.initialize()
 
 
 # Convenience alias for direct access
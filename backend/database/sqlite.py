@@ -11,6 +11,7 @@ from typing import Optional, TypeVar, Generic
 from uuid import uuid4
 
 from config import get_app_data_dir
+from core.json_codec import json_loads
 from database.base import BaseTable, BaseDatabase
 
 logger = logging.getLogger(__name__)
@@ -18,6 +19,12 @@ logger = logging.getLogger(__name__)
 T = TypeVar("T", bound=dict)
 
 
+def _connect(db_path: Path | str) -> aiosqlite.Connection:
+    """Open a connection; ``file:`` paths are SQLite URIs (e.g. shared memory)."""
+    path = str(db_path)
+    return aiosqlite.connect(path, uri=path.startswith("file:"))
+
+
 class SQLiteTable(BaseTable[T], Generic[T]):
     """SQLite table implementation of BaseTable interface."""
 
@@ -33,7 +40,7 @@ class SQLiteTable(BaseTable[T], Generic[T]):
                 conn.row_factory = aiosqlite.Row
                 # use conn
         """
-        return aiosqlite.connect(str(self.db_path))
+        return _connect(self.db_path)
 
     def _row_to_dict(self, row: aiosqlite.Row) -> dict:
         """Convert a SQLite row to a dictionary, parsing JSON fields."""
@@ -44,8 +51,8 @@ class SQLiteTable(BaseTable[T], Generic[T]):
         for key, value in result.items():
             if isinstance(value, str) and (value.startswith('[') or value.startswith('{')):
                 try:
-                    result[key] = json.loads(value)
-                except json.JSONDecodeError:
+                    result[key] = json_loads(value)
+                except ValueError:
                     pass
         return result
 
@@ -330,8 +337,17 @@ class SQLitePluginsTable(SQLiteTable[T], Generic[T]):
 class SQLiteTasksTable(SQLiteTable[T], Generic[T]):
     """Specialized SQLite table for tasks with status filtering and counting."""
 
-    async def list_all(self, status: Optional[str] = None, agent_id: Optional[str] = None) -> list[T]:
-        """List all tasks, optionally filtered by status or agent_id."""
+    async def list_all(
+        self,
+        status: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> list[T]:
+        """List tasks newest first, optionally filtered by status or agent_id.
+
+        *limit*/*offset* page through the results; no limit returns all rows.
+        """
         async with self._get_connection() as conn:
             conn.row_factory = aiosqlite.Row
             query = "SELECT * FROM tasks WHERE 1=1"
@@ -343,6 +359,9 @@ class SQLiteTasksTable(SQLiteTable[T], Generic[T]):
                 query += " AND agent_id = ?"
                 params.append(agent_id)
             query += " ORDER BY created_at DESC"
+            if limit is not None:
+                query += " LIMIT ? OFFSET ?"
+                params.extend((limit, offset))
             async with conn.execute(query, params) as cursor:
                 rows = await cursor.fetchall()
                 return [self._row_to_dict(row) for row in rows]
@@ -380,6 +399,36 @@ class SQLiteTasksTable(SQLiteTable[T], Generic[T]):
                 return [self._row_to_dict(row) for row in rows]
 
 
+class SQLiteChannelsTable(SQLiteTable[T], Generic[T]):
+    """Specialized SQLite table for channels, joined with their agent's name."""
+
+    _SELECT_WITH_AGENT_NAME = (
+        "SELECT c.*, a.name AS agent_name FROM channels c "
+        "LEFT JOIN agents a ON a.id = c.agent_id"
+    )
+
+    async def list_with_agent_name(self) -> list[T]:
+        """List all channels with an extra ``agent_name`` field."""
+        async with self._get_connection() as conn:
+            conn.row_factory = aiosqlite.Row
+            async with conn.execute(
+                f"{self._SELECT_WITH_AGENT_NAME} ORDER BY c.created_at DESC"
+            ) as cursor:
+                rows = await cursor.fetchall()
+                return [self._row_to_dict(row) for row in rows]
+
+    async def get_with_agent_name(self, channel_id: str) -> Optional[T]:
+        """Get a channel by ID with an extra ``agent_name`` field."""
+        async with self._get_connection() as conn:
+            conn.row_factory = aiosqlite.Row
+            async with conn.execute(
+                f"{self._SELECT_WITH_AGENT_NAME} WHERE c.id = ?",
+                (channel_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+                return self._row_to_dict(row) if row else None
+
+
 class SQLiteChannelSessionsTable(SQLiteTable[T], Generic[T]):
     """Specialized SQLite table for channel sessions with lookup support."""
 
@@ -436,10 +485,52 @@ class SQLiteChannelSessionsTable(SQLiteTable[T], Generic[T]):
             await conn.commit()
             return cursor.rowcount
 
+    async def increment_message_count(
+        self, channel_session_id: str, delta: int, last_message_at: str
+    ) -> bool:
+        """Atomically bump message_count and set last_message_at."""
+        async with self._get_connection() as conn:
+            cursor = await conn.execute(
+                f"UPDATE {self.table_name} "
+                "SET message_count = COALESCE(message_count, 0) + ?, "
+                "last_message_at = ?, updated_at = ? WHERE id = ?",
+                (delta, last_message_at, datetime.now().isoformat(), channel_session_id)
+            )
+            await conn.commit()
+            return cursor.rowcount > 0
+
 
 class SQLiteChannelMessagesTable(SQLiteTable[T], Generic[T]):
     """Specialized SQLite table for channel messages."""
 
+    async def put_many(self, items: list[T]) -> list[T]:
+        """Insert several new messages in a single transaction.
+
+        Unlike :meth:`put` this never updates: every item must carry a
+        fresh ``id`` (one is generated if missing).  The caller's dicts are
+        left untouched; the stored rows are returned as new dicts.
+        """
+        if not items:
+            return []
+        now = datetime.now().isoformat()
+        stored: list[T] = []
+        async with self._get_connection() as conn:
+            for item in items:
+                item = dict(item)
+                if "id" not in item:
+                    item["id"] = str(uuid4())
+                item.setdefault("created_at", now)
+                item["updated_at"] = now
+                columns = list(item.keys())
+                placeholders = ", ".join("?" for _ in columns)
+                await conn.execute(
+                    f"INSERT INTO {self.table_name} ({', '.join(columns)}) VALUES ({placeholders})",
+                    [self._serialize_value(item[col]) for col in columns]
+                )
+                stored.append(item)
+            await conn.commit()
+        return stored
+
     async def list_by_session(self, channel_session_id: str) -> list[T]:
         """List all messages for a channel session."""
         async with self._get_connection() as conn:
@@ -695,6 +786,7 @@ class SQLiteDatabase(BaseDatabase):
     );
     CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
     CREATE INDEX IF NOT EXISTS idx_tasks_agent_id ON tasks(agent_id);
+    CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks(created_at);
 
     -- Channels table
     CREATE TABLE IF NOT EXISTS channels (
@@ -740,6 +832,8 @@ class SQLiteDatabase(BaseDatabase):
     );
     CREATE INDEX IF NOT EXISTS idx_channel_sessions_lookup
         ON channel_sessions(channel_id, external_chat_id, external_thread_id);
+    CREATE INDEX IF NOT EXISTS idx_channel_sessions_recent
+        ON channel_sessions(channel_id, last_message_at);
 
     -- Channel messages table (audit log)
     CREATE TABLE IF NOT EXISTS channel_messages (
@@ -763,14 +857,15 @@ class SQLiteDatabase(BaseDatabase):
         """Initialize SQLite database.
 
         Args:
-            db_path: Path to the SQLite database file. If None, uses default location.
+            db_path: Path to the SQLite database file, or a ``file:`` URI
+                (e.g. a shared in-memory database). If None, uses default location.
         """
         if db_path is None:
             # Default to user data directory
             data_dir = get_app_data_dir()
             data_dir.mkdir(parents=True, exist_ok=True)
             db_path = data_dir / "data.db"
-        else:
+        elif not str(db_path).startswith("file:"):
             db_path = Path(db_path)
             db_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -790,7 +885,7 @@ class SQLiteDatabase(BaseDatabase):
         self._plugins = SQLitePluginsTable[dict]("plugins", self.db_path)
         self._permission_requests = SQLiteTable[dict]("permission_requests", self.db_path)
         self._tasks = SQLiteTasksTable[dict]("tasks", self.db_path)
-        self._channels = SQLiteTable[dict]("channels", self.db_path)
+        self._channels = SQLiteChannelsTable[dict]("channels", self.db_path)
         self._channel_sessions = SQLiteChannelSessionsTable[dict]("channel_sessions", self.db_path)
         self._channel_messages = SQLiteChannelMessagesTable[dict]("channel_messages", self.db_path)
 
@@ -799,7 +894,7 @@ class SQLiteDatabase(BaseDatabase):
         if self._initialized:
             return
 
-        async with aiosqlite.connect(str(self.db_path)) as conn:
+        async with _connect(self.db_path) as conn:
             await conn.executescript(self.SCHEMA)
             await conn.commit()
 
@@ -939,7 +1034,7 @@ class SQLiteDatabase(BaseDatabase):
         return self._tasks
 
     @property
-    def channels(self) -> SQLiteTable:
+    def channels(self) -> SQLiteChannelsTable:
         """Get the channels table."""
         return self._channels
 
@@ -956,7 +1051,7 @@ class SQLiteDatabase(BaseDatabase):
     async def health_check(self) -> bool:
         """Check if the database is healthy."""
         try:
-            async with aiosqlite.connect(str(self.db_path)) as conn:
+            async with _connect(self.db_path) as conn:
                 await conn.execute("SELECT 1")
             return True
         except Exception:
@@ -15,8 +15,11 @@ Environment variables:
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import os
+import stat
 from pathlib import Path
 
 from mcp.server.fastmcp import FastMCP
@@ -50,6 +53,20 @@ def _feishu_file_type(file_path: Path) -> str:
     return _FILE_TYPE_MAP.get(file_path.suffix.lower(), "stream")
 
 
+@functools.lru_cache(maxsize=4)
+def _resolve_workspace(workspace: str) -> Path:
+    """Resolve WORKSPACE_DIR once per value instead of on every tool call."""
+    return Path(workspace).resolve()
+
+
+@functools.lru_cache(maxsize=4)
+def _get_lark_client(app_id: str, app_secret: str):
+    """Build one lark client per credential pair and reuse it across sends."""
+    import lark_oapi as lark
+
+    return lark.Client.builder().app_id(app_id).app_secret(app_secret).build()
+
+
 # ---------------------------------------------------------------------------
 # Feishu sending logic
 # ---------------------------------------------------------------------------
@@ -57,7 +74,6 @@ def _feishu_file_type(file_path: Path) -> str:
 def _send_via_feishu(file_path: Path, message: str) -> str:
     """Upload a file/image to Feishu and send it to the configured chat."""
     try:
-        import lark_oapi as lark
         from lark_oapi.api.im.v1 import (
             CreateFileRequest,
             CreateFileRequestBody,
@@ -81,7 +97,7 @@ def _send_via_feishu(file_path: Path, message: str) -> str:
     if not chat_id:
         return "Error: CHAT_ID is required."
 
-    client = lark.Client.builder().app_id(app_id).app_secret(app_secret).build()
+    client = _get_lark_client(app_id, app_secret)
 
     is_image = _is_image(file_path)
 
@@ -207,7 +223,7 @@ server = FastMCP("channel-tools")
 
 
 @server.tool()
-def send_file(file_path: str, message: str = "") -> str:
+async def send_file(file_path: str, message: str = "") -> str:
     """Send a file from the workspace to the user via the channel.
 
     Supports images (png, jpg, jpeg, gif, webp, bmp) and general files
@@ -226,18 +242,17 @@ def send_file(file_path: str, message: str = "") -> str:
     # Validate path is within workspace if WORKSPACE_DIR is set
     workspace = os.environ.get("WORKSPACE_DIR", "")
     if workspace:
-        workspace_root = Path(workspace).resolve()
-        if not str(path).startswith(str(workspace_root) + os.sep) and path != workspace_root:
+        if not path.is_relative_to(_resolve_workspace(workspace)):
             return f"Error: File path must be within the agent workspace: {workspace}"
 
-    # Validate existence
-    if not path.exists():
+    # Validate existence and size from a single stat
+    try:
+        st = path.stat()
+    except OSError:
         return f"Error: File not found: {file_path}"
-    if not path.is_file():
+    if not stat.S_ISREG(st.st_mode):
         return f"Error: Path is not a file: {file_path}"
-
-    # Validate size
-    size = path.stat().st_size
+    size = st.st_size
     if _is_image(path):
         if size > _MAX_IMAGE_SIZE:
             return (
@@ -254,7 +269,8 @@ def send_file(file_path: str, message: str = "") -> str:
     channel_type = os.environ.get("CHANNEL_TYPE", "")
 
     if channel_type == "feishu":
-        return _send_via_feishu(path, message)
+        # The lark client is synchronous; keep uploads off the server's event loop
+        return await asyncio.to_thread(_send_via_feishu, path, message)
     else:
         return f"Error: Unsupported channel type '{channel_type}'. Currently only 'feishu' is supported."
 
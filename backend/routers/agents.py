@@ -179,6 +179,7 @@ async def update_agent(agent_id: str, request: AgentUpdateRequest):
         logger.info(f"Global User Mode enabled for agent {agent_id} - setting allow_all_skills=True, clearing skill_ids")
 
     agent = await db.agents.update(agent_id, updates)
+    task_manager.invalidate_agent(agent_id)
 
     # Check if skill_ids, allow_all_skills, or plugin_ids changed - if so, rebuild workspace
     skill_ids_changed = "skill_ids" in updates
@@ -218,6 +219,7 @@ async def delete_agent(agent_id: str):
         )
 
     deleted = await db.agents.delete(agent_id)
+    task_manager.invalidate_agent(agent_id)
     if not deleted:
         raise AgentNotFoundException(
             detail=f"Agent with ID '{agent_id}' does not exist",
@@ -1,6 +1,9 @@
 """Channel management CRUD and lifecycle API endpoints."""
+import asyncio
 import json
 import logging
+import time
+from collections import OrderedDict
 from typing import Optional
 
 from fastapi import APIRouter
@@ -21,33 +24,34 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Short-lived cache of channel rows for the lifecycle/session endpoints'
+# existence checks: channel_id -> (expires_at, row), least recently used first
+_CHANNEL_TTL = 5.0
+_CHANNEL_CACHE_SIZE = 256
+_channel_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
 
 # ============== Helper Functions ==============
 
-def _parse_json_list(value) -> list:
-    """Parse a JSON string to a list, or return the value if already a list."""
-    if isinstance(value, str):
-        try:
-            parsed = json.loads(value)
-            return parsed if isinstance(parsed, list) else []
-        except (json.JSONDecodeError, TypeError):
-            return []
+def _as_list(value) -> list:
+    """Return *value* if it is a list, else an empty list."""
     return value if isinstance(value, list) else []
 
 
 def _channel_to_response(channel_data: dict, agent_name: Optional[str] = None) -> ChannelResponse:
     """Convert a database channel dict to a ChannelResponse.
 
-    Handles JSON parsing for list fields and integer-to-bool conversion
-    for SQLite-stored boolean fields.
+    JSON columns arrive already decoded by the SQLite layer; values that
+    failed to decode fall back to empty defaults.  Handles integer-to-bool
+    conversion for SQLite-stored boolean fields.  *agent_name* defaults to
+    the ``agent_name`` column of rows read with the agent JOIN.
     """
-    # Parse config if stored as JSON string
-    config = channel_data.get("config", {})
-    if isinstance(config, str):
-        try:
-            config = json.loads(config)
-        except (json.JSONDecodeError, TypeError):
-            config = {}
+    if agent_name is None:
+        agent_name = channel_data.get("agent_name")
+
+    config = channel_data.get("config")
+    if not isinstance(config, dict):
+        config = {}
 
     return ChannelResponse(
         id=channel_data["id"],
@@ -59,8 +63,8 @@ def _channel_to_response(channel_data: dict, agent_name: Optional[str] = None) -
         status=channel_data.get("status", "inactive"),
         error_message=channel_data.get("error_message"),
         access_mode=channel_data.get("access_mode", "allowlist"),
-        allowed_senders=_parse_json_list(channel_data.get("allowed_senders", [])),
-        blocked_senders=_parse_json_list(channel_data.get("blocked_senders", [])),
+        allowed_senders=_as_list(channel_data.get("allowed_senders")),
+        blocked_senders=_as_list(channel_data.get("blocked_senders")),
         rate_limit_per_minute=int(channel_data.get("rate_limit_per_minute", 10)),
         enable_skills=bool(channel_data.get("enable_skills", False)),
         enable_mcp=bool(channel_data.get("enable_mcp", False)),
@@ -69,22 +73,33 @@ def _channel_to_response(channel_data: dict, agent_name: Optional[str] = None) -
     )
 
 
+async def _get_channel_cached(channel_id: str) -> dict:
+    """Get a channel row, reusing a recent read; 404 if it does not exist."""
+    now = time.monotonic()
+    cached = _channel_cache.get(channel_id)
+    if cached is not None and cached[0] > now:
+        _channel_cache.move_to_end(channel_id)
+        return cached[1]
+    channel = await db.channels.get(channel_id)
+    if not channel:
+        _channel_cache.pop(channel_id, None)
+        raise NotFoundException(
+            detail=f"Channel with ID '{channel_id}' not found"
+        )
+    _channel_cache[channel_id] = (now + _CHANNEL_TTL, channel)
+    _channel_cache.move_to_end(channel_id)
+    if len(_channel_cache) > _CHANNEL_CACHE_SIZE:
+        _channel_cache.popitem(last=False)
+    return channel
+
+
 # ============== CRUD Endpoints ==============
 
 @router.get("/", response_model=list[ChannelResponse])
 async def list_channels():
     """List all channels, enriched with agent names."""
-    channels = await db.channels.list()
-    results = []
-    # Build a cache of agent names to avoid repeated lookups
-    agent_cache: dict[str, Optional[str]] = {}
-    for ch in channels:
-        agent_id = ch.get("agent_id")
-        if agent_id not in agent_cache:
-            agent = await db.agents.get(agent_id)
-            agent_cache[agent_id] = agent["name"] if agent else None
-        results.append(_channel_to_response(ch, agent_name=agent_cache[agent_id]))
-    return results
+    channels = await db.channels.list_with_agent_name()
+    return [_channel_to_response(ch) for ch in channels]
 
 
 @router.get("/types")
@@ -96,15 +111,12 @@ async def list_channel_types():
 @router.get("/{channel_id}", response_model=ChannelResponse)
 async def get_channel(channel_id: str):
     """Get a single channel by ID."""
-    channel = await db.channels.get(channel_id)
+    channel = await db.channels.get_with_agent_name(channel_id)
     if not channel:
         raise NotFoundException(
             detail=f"Channel with ID '{channel_id}' not found"
         )
-    # Enrich with agent name
-    agent = await db.agents.get(channel["agent_id"])
-    agent_name = agent["name"] if agent else None
-    return _channel_to_response(channel, agent_name=agent_name)
+    return _channel_to_response(channel)
 
 
 @router.post("/", response_model=ChannelResponse, status_code=201)
@@ -139,47 +151,36 @@ async def create_channel(request: ChannelCreateRequest):
 @router.put("/{channel_id}", response_model=ChannelResponse)
 async def update_channel(channel_id: str, request: ChannelUpdateRequest):
     """Update a channel. Only non-None fields are updated."""
-    channel = await db.channels.get(channel_id)
+    channel = await db.channels.get_with_agent_name(channel_id)
     if not channel:
         raise NotFoundException(
             detail=f"Channel with ID '{channel_id}' not found"
         )
-
-    updates = {}
-    if request.name is not None:
-        updates["name"] = request.name
-    if request.config is not None:
-        updates["config"] = request.config
-    if request.agent_id is not None:
+    agent_name = channel.get("agent_name")
+
+    # Only fields the client actually sent with a non-null value (a
+    # top-level filter: exclude_none would also strip nulls inside config)
+    updates = {
+        key: value
+        for key, value in request.model_dump(exclude_unset=True).items()
+        if value is not None
+    }
+    if "agent_id" in updates:
         # Validate the new agent exists
-        agent = await db.agents.get(request.agent_id)
+        agent = await db.agents.get(updates["agent_id"])
         if not agent:
             raise NotFoundException(
-                detail=f"Agent with ID '{request.agent_id}' not found"
+                detail=f"Agent with ID '{updates['agent_id']}' not found"
             )
-        updates["agent_id"] = request.agent_id
-    if request.access_mode is not None:
-        updates["access_mode"] = request.access_mode
-    if request.allowed_senders is not None:
-        updates["allowed_senders"] = request.allowed_senders
-    if request.blocked_senders is not None:
-        updates["blocked_senders"] = request.blocked_senders
-    if request.rate_limit_per_minute is not None:
-        updates["rate_limit_per_minute"] = request.rate_limit_per_minute
-    if request.enable_skills is not None:
-        updates["enable_skills"] = request.enable_skills
-    if request.enable_mcp is not None:
-        updates["enable_mcp"] = request.enable_mcp
+        agent_name = agent["name"]
 
     if updates:
         updated = await db.channels.update(channel_id, updates)
         if updated:
             channel = updated
-
-    # Enrich with agent name
-    agent_id = channel.get("agent_id") if channel else None
-    agent = await db.agents.get(agent_id) if agent_id else None
-    agent_name = agent["name"] if agent else None
+        # Running channels pick up the new settings on their next message
+        channel_gateway.invalidate_channel(channel_id)
+        _channel_cache.pop(channel_id, None)
 
     logger.info(f"Updated channel '{channel_id}' with fields: {list(updates.keys())}")
     return _channel_to_response(channel, agent_name=agent_name)
@@ -188,38 +189,37 @@ async def update_channel(channel_id: str, request: ChannelUpdateRequest):
 @router.delete("/{channel_id}", status_code=204)
 async def delete_channel(channel_id: str):
     """Delete a channel. Stops the channel if active and removes all sessions."""
-    channel = await db.channels.get(channel_id)
-    if not channel:
-        raise NotFoundException(
-            detail=f"Channel with ID '{channel_id}' not found"
-        )
-
-    # Stop channel and cancel any pending retries before deletion
-    try:
-        await channel_gateway.stop_channel(channel_id)
+    await _get_channel_cached(channel_id)
+
+    # Stop channel (cancelling any pending retries) and delete all channel
+    # sessions concurrently; neither depends on the other
+    stop_result, deleted_sessions = await asyncio.gather(
+        channel_gateway.stop_channel(channel_id),
+        db.channel_sessions.delete_by_channel(channel_id),
+        return_exceptions=True,
+    )
+    if isinstance(stop_result, Exception):
+        logger.warning(f"Error stopping channel '{channel_id}' during deletion: {stop_result}")
+    elif isinstance(stop_result, BaseException):
+        raise stop_result
+    else:
         logger.info(f"Stopped channel '{channel_id}' before deletion")
-    except Exception as e:
-        logger.warning(f"Error stopping channel '{channel_id}' during deletion: {e}")
-
-    # Delete all channel sessions
-    deleted_sessions = await db.channel_sessions.delete_by_channel(channel_id)
+    if isinstance(deleted_sessions, BaseException):
+        raise deleted_sessions
     logger.info(f"Deleted {deleted_sessions} sessions for channel '{channel_id}'")
 
     # Delete the channel
     await db.channels.delete(channel_id)
+    _channel_cache.pop(channel_id, None)
     logger.info(f"Deleted channel '{channel_id}'")
 
 
 # ============== Lifecycle Endpoints ==============
 
-@router.post("/{channel_id}/start")
+@router.post("/{channel_id}/start", response_model=ChannelStatusResponse)
 async def start_channel(channel_id: str):
     """Start a channel, activating its adapter to listen for messages."""
-    channel = await db.channels.get(channel_id)
-    if not channel:
-        raise NotFoundException(
-            detail=f"Channel with ID '{channel_id}' not found"
-        )
+    await _get_channel_cached(channel_id)
 
     try:
         await channel_gateway.start_channel(channel_id)
@@ -244,11 +244,7 @@ async def start_channel(channel_id: str):
 @router.post("/{channel_id}/stop")
 async def stop_channel(channel_id: str):
     """Stop a running channel."""
-    channel = await db.channels.get(channel_id)
-    if not channel:
-        raise NotFoundException(
-            detail=f"Channel with ID '{channel_id}' not found"
-        )
+    await _get_channel_cached(channel_id)
 
     try:
         await channel_gateway.stop_channel(channel_id)
@@ -262,14 +258,10 @@ async def stop_channel(channel_id: str):
     return {"channel_id": channel_id, "status": "inactive"}
 
 
-@router.post("/{channel_id}/restart")
+@router.post("/{channel_id}/restart", response_model=ChannelStatusResponse)
 async def restart_channel(channel_id: str):
     """Restart a channel (stop then start)."""
-    channel = await db.channels.get(channel_id)
-    if not channel:
-        raise NotFoundException(
-            detail=f"Channel with ID '{channel_id}' not found"
-        )
+    await _get_channel_cached(channel_id)
 
     try:
         await channel_gateway.restart_channel(channel_id)
@@ -294,11 +286,7 @@ async def restart_channel(channel_id: str):
 @router.get("/{channel_id}/status", response_model=ChannelStatusResponse)
 async def get_channel_status(channel_id: str):
     """Get the runtime status of a channel."""
-    channel = await db.channels.get(channel_id)
-    if not channel:
-        raise NotFoundException(
-            detail=f"Channel with ID '{channel_id}' not found"
-        )
+    await _get_channel_cached(channel_id)
 
     status = await channel_gateway.get_channel_status(channel_id)
     return ChannelStatusResponse(
@@ -318,6 +306,7 @@ async def test_channel(channel_id: str):
     Instantiates the adapter and calls validate_config() to check
     that credentials and settings are valid.
     """
+    # Always read fresh: the point is to check the current configuration
     channel = await db.channels.get(channel_id)
     if not channel:
         raise NotFoundException(
@@ -365,25 +354,7 @@ async def test_channel(channel_id: str):
 @router.get("/{channel_id}/sessions", response_model=list[ChannelSessionResponse])
 async def list_channel_sessions(channel_id: str):
     """List all sessions for a channel."""
-    channel = await db.channels.get(channel_id)
-    if not channel:
-        raise NotFoundException(
-            detail=f"Channel with ID '{channel_id}' not found"
-        )
+    await _get_channel_cached(channel_id)
 
-    sessions = await db.channel_sessions.list_by_channel(channel_id)
-    return [
-        ChannelSessionResponse(
-            id=s["id"],
-            channel_id=s["channel_id"],
-            external_chat_id=s["external_chat_id"],
-            external_sender_id=s.get("external_sender_id"),
-            external_thread_id=s.get("external_thread_id"),
-            session_id=s["session_id"],
-            sender_display_name=s.get("sender_display_name"),
-            message_count=int(s.get("message_count", 0)),
-            last_message_at=s.get("last_message_at"),
-            created_at=s["created_at"],
-        )
-        for s in sessions
-    ]
+    # Session columns match the response fields; response_model validates them
+    return await db.channel_sessions.list_by_channel(channel_id)
@@ -15,6 +15,7 @@ from schemas.marketplace import (
 )
 from database import db
 from core.plugin_manager import plugin_manager
+from core.task_manager import task_manager
 from core.exceptions import (
     NotFoundException,
     ValidationException,
@@ -479,6 +480,7 @@ async def _remove_plugin_from_agents(plugin_id: str) -> int:
             # Remove the plugin ID from the list
             new_plugin_ids = [pid for pid in plugin_ids if pid != plugin_id]
             await db.agents.update(agent["id"], {"plugin_ids": json.dumps(new_plugin_ids)})
+            task_manager.invalidate_agent(agent["id"])
             agents_updated += 1
             logger.info(f"Removed plugin {plugin_id} from agent '{agent['name']}' ({agent['id']})")
 
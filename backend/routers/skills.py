@@ -19,6 +19,7 @@ from schemas.skill import (
 from database import db
 from core.skill_manager import skill_manager
 from core.agent_manager import agent_manager
+from core.task_manager import task_manager
 from core.exceptions import (
     SkillNotFoundException,
     ValidationException,
@@ -31,6 +32,16 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Characters not allowed in skill folder names
+_UNSAFE_SKILL_NAME_RE = re.compile(r'[^a-zA-Z0-9_-]')
+# Skill folder in a storage location such as s3://bucket/skills/name/...
+_SKILL_LOCATION_RE = re.compile(r'/skills/([^/]+)/')
+
+
+def _sanitize_skill_name(name: str) -> str:
+    """Lower-case *name* and replace unsafe characters for use as a folder name."""
+    return _UNSAFE_SKILL_NAME_RE.sub('-', name.lower())
+
 
 @router.get("", response_model=list[SkillResponse])
 async def list_skills():
@@ -106,7 +117,7 @@ async def upload_skill(
     # Determine skill name
     skill_name = name or file.filename.replace(".zip", "")
     # Sanitize skill name for use as folder name
-    skill_name = re.sub(r'[^a-zA-Z0-9_-]', '-', skill_name.lower())
+    skill_name = _sanitize_skill_name(skill_name)
 
     try:
         # Read file content
@@ -296,13 +307,13 @@ async def delete_skill(skill_id: str):
 
     if s3_location:
         # Extract from s3://bucket/skills/name/... format
-        match = re.search(r'/skills/([^/]+)/', s3_location)
+        match = _SKILL_LOCATION_RE.search(s3_location)
         if match:
             skill_folder_name = match.group(1)
 
     if not skill_folder_name:
         # Fallback: sanitize skill name
-        skill_folder_name = re.sub(r'[^a-zA-Z0-9_-]', '-', skill.get("name", "").lower())
+        skill_folder_name = _sanitize_skill_name(skill.get("name", ""))
 
     # Delete files from local and S3 (all versions)
     if skill_folder_name:
@@ -364,7 +375,7 @@ async def generate_skill_with_agent(request: Request):
             )
 
         # Sanitize skill name for use as folder name
-        sanitized_name = re.sub(r'[^a-zA-Z0-9_-]', '-', skill_name.lower())
+        sanitized_name = _sanitize_skill_name(skill_name)
 
         logger.info(f"Starting skill generation with agent: {sanitized_name}, model: {model or 'default'}")
 
@@ -425,7 +436,7 @@ async def finalize_skill(request: SkillFinalizeRequest):
     After this, use POST /{skill_id}/publish to publish as a new version.
     """
     # Sanitize skill name
-    skill_name = re.sub(r'[^a-zA-Z0-9_-]', '-', request.skill_name.lower())
+    skill_name = _sanitize_skill_name(request.skill_name)
 
     # Get display name (user input) or fall back to sanitized name
     display_name = request.display_name
@@ -561,6 +572,7 @@ async def _remove_skill_from_agents(skill_id: str) -> int:
             # Remove the skill ID from the list
             new_skill_ids = [sid for sid in skill_ids if sid != skill_id]
             await db.agents.update(agent["id"], {"skill_ids": json.dumps(new_skill_ids)})
+            task_manager.invalidate_agent(agent["id"])
             agents_updated += 1
             logger.info(f"Removed skill {skill_id} from agent '{agent['name']}' ({agent['id']})")
 
@@ -574,11 +586,11 @@ def _get_skill_folder_name(skill: dict) -> str:
     s3_location = skill.get("s3_location") or skill.get("draft_s3_location", "")
     if s3_location:
         # Extract from s3://bucket/skills/name/... format
-        match = re.search(r'/skills/([^/]+)/', s3_location)
+        match = _SKILL_LOCATION_RE.search(s3_location)
         if match:
             return match.group(1)
     # Fallback: sanitize skill name
-    return re.sub(r'[^a-zA-Z0-9_-]', '-', skill.get("name", "").lower())
+    return _sanitize_skill_name(skill.get("name", ""))
 
 
 @router.get("/{skill_id}/versions", response_model=SkillVersionListResponse)
@@ -1,18 +1,25 @@
 """Tasks API endpoints for background agent task management."""
 import asyncio
-import json
 import logging
 from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 
 from schemas.task import TaskCreate, TaskResponse, TaskMessageRequest, RunningTaskCount
 from core.task_manager import task_manager
+from core.json_codec import json_dumps_bytes
 from database import db
 
 logger = logging.getLogger(__name__)
 
+# SSE frame delimiters, preallocated for the event stream
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+
+_TASK_LIST_ADAPTER = TypeAdapter(list[TaskResponse])
+
 router = APIRouter()
 
 
@@ -20,10 +27,17 @@ router = APIRouter()
 async def list_tasks(
     status: Optional[str] = Query(None, description="Filter by status"),
     agent_id: Optional[str] = Query(None, description="Filter by agent ID"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Max tasks to return"),
+    offset: int = Query(0, ge=0, description="Tasks to skip (with limit)"),
 ):
-    """List all tasks, optionally filtered by status or agent_id."""
-    tasks = await task_manager.list_tasks(status=status, agent_id=agent_id)
-    return [TaskResponse(**task) for task in tasks]
+    """List tasks newest first, optionally filtered by status or agent_id.
+
+    Pass ``limit``/``offset`` to page through large task lists.
+    """
+    tasks = await task_manager.list_tasks(
+        status=status, agent_id=agent_id, limit=limit, offset=offset
+    )
+    return _TASK_LIST_ADAPTER.validate_python(tasks)
 
 
 @router.get("/running/count", response_model=RunningTaskCount)
@@ -99,8 +113,12 @@ async def stream_task(task_id: str):
 
     async def event_generator():
         try:
-            async for event in task_manager.subscribe(task_id):
-                yield f"data: {json.dumps(event)}\n\n"
+            # One chunk per batch of queued events, one SSE frame per event
+            async for batch in task_manager.subscribe_batches(task_id):
+                yield b"".join(
+                    _SSE_PREFIX + json_dumps_bytes(event) + _SSE_SUFFIX
+                    for event in batch
+                )
         except asyncio.CancelledError:
             logger.info(f"SSE stream cancelled for task {task_id}")
 
@@ -1,10 +1,10 @@
 """Test fixtures and configuration for backend tests."""
 import pytest
 import asyncio
-import tempfile
-import os
+import sqlite3
 from pathlib import Path
-from typing import Generator, AsyncGenerator
+from types import MappingProxyType
+from typing import Generator, AsyncGenerator, Mapping
 
 from fastapi.testclient import TestClient
 from httpx import AsyncClient, ASGITransport
@@ -17,47 +17,33 @@ from database.sqlite import SQLiteDatabase
 # Test database setup
 # ---------------------------------------------------------------------------
 
-# Create a temp file for the test database (once per process).
-_test_db_fd, _test_db_path = tempfile.mkstemp(suffix=".db", prefix="owork_test_")
-os.close(_test_db_fd)
-
-# Replace the global db singleton with one pointing at the temp file.
-_test_db = SQLiteDatabase(db_path=_test_db_path)
+# Shared in-memory test database: every connection in this process sees the
+# same tables, with no file I/O.  The memdb VFS (rather than cache=shared)
+# keeps SQLite's normal file locking, so concurrent requests wait on the busy
+# timeout instead of failing with "database table is locked".  The keeper
+# connection stays open for the whole session so the database is not
+# discarded between connections.
+_test_db_uri = "file:/owork_test?vfs=memdb"
+_test_db_keeper = sqlite3.connect(_test_db_uri, uri=True, check_same_thread=False)
+
+# Replace the global db singleton with one pointing at the shared database.
+_test_db = SQLiteDatabase(db_path=_test_db_uri)
 database_module.db = _test_db
 database_module._db_instance = _test_db
 
 
-# Tables that are cleared between tests (order doesn't matter for DELETE).
-_TABLES_TO_CLEAR = [
-    "channel_messages",
-    "channel_sessions",
-    "channels",
-    "tasks",
-    "permission_requests",
-    "messages",
-    "sessions",
-    "skill_versions",
-    "skills",
-    "mcp_servers",
-    "agents",
-    "plugins",
-    "marketplaces",
-    "users",
-    "app_settings",
-]
+# Clean, seeded copy of the test database: taken on first use, then restored
+# into the shared database before every test.
+_snapshot: sqlite3.Connection | None = None
 
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create an event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
-    # Clean up temp database file
+def pytest_asyncio_loop_factories(config, item):
+    """Run async tests on uvloop where it is installed (not on Windows)."""
     try:
-        os.unlink(_test_db_path)
-    except OSError:
-        pass
+        import uvloop
+    except ImportError:
+        return {"asyncio": asyncio.new_event_loop}
+    return {"uvloop": uvloop.new_event_loop}
 
 
 @pytest.fixture
@@ -83,44 +69,63 @@ async def async_client() -> AsyncGenerator[AsyncClient, None]:
 
 @pytest.fixture(autouse=True)
 async def reset_database():
-    """Reset database tables before each test.
+    """Reset the database to a clean, seeded state before each test.
 
-    Deletes all rows from every application table so tests start with a
-    clean slate, then seeds the default agent that the app expects to
-    exist.  Runs as an async fixture so it can use aiosqlite.
+    The first call creates the schema and seeds the default agent that the
+    app expects to exist, then snapshots the database.  Later calls restore
+    that snapshot with SQLite's backup API (a page copy) instead of
+    deleting and re-inserting rows.
     """
-    # Ensure schema exists (idempotent)
-    await _test_db.initialize()
-
-    # Clear all tables before the test
-    import aiosqlite
-    async with aiosqlite.connect(str(_test_db.db_path)) as conn:
-        for table in _TABLES_TO_CLEAR:
-            await conn.execute(f"DELETE FROM {table}")
-        await conn.commit()
-
-    # Seed the default agent (the app and tests expect it to exist)
-    from datetime import datetime
-    now = datetime.now().isoformat()
-    await _test_db.agents.put({
-        "id": "default",
-        "name": "Default Agent",
-        "description": "Default system agent",
-        "model": "claude-sonnet-4-20250514",
-        "permission_mode": "default",
-        "created_at": now,
-        "updated_at": now,
-    })
+    global _snapshot
+    if _snapshot is not None:
+        _snapshot.backup(_test_db_keeper)
+    else:
+        await _test_db.initialize()
+
+        # Seed the default agent (the app and tests expect it to exist)
+        from datetime import datetime
+        now = datetime.now().isoformat()
+        await _test_db.agents.put({
+            "id": "default",
+            "name": "Default Agent",
+            "description": "Default system agent",
+            "model": "claude-sonnet-4-20250514",
+            "permission_mode": "default",
+            "created_at": now,
+            "updated_at": now,
+        })
+
+        _snapshot = sqlite3.connect(":memory:", check_same_thread=False)
+        _test_db_keeper.backup(_snapshot)
 
     yield
 
-    # No teardown needed — next test will clear tables again.
+    # No teardown needed — next test will restore the snapshot again.
 
 
 # ---------------------------------------------------------------------------
 # Sample test data fixtures
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(autouse=True)
+def agent_workspace(tmp_path, monkeypatch) -> Path:
+    """Point the agent workspace (and its skills folder) at a temp directory.
+
+    Keeps skill uploads and generated files out of the repository tree.
+    """
+    from config import settings
+    from core.skill_manager import skill_manager
+    from core.workspace_manager import workspace_manager
+
+    workspace = tmp_path / "workspace"
+    skills_dir = workspace / ".claude" / "skills"
+    monkeypatch.setattr(settings, "agent_workspace_dir", str(workspace))
+    monkeypatch.setattr(skill_manager, "local_dir", skills_dir)
+    monkeypatch.setattr(workspace_manager, "main_workspace", workspace)
+    monkeypatch.setattr(workspace_manager, "main_skills_dir", skills_dir)
+    return workspace
+
+
 @pytest.fixture
 def sample_agent_data():
     """Sample agent data for tests."""
@@ -150,10 +155,10 @@ def sample_skill_data():
     }
 
 
-@pytest.fixture
-def sample_mcp_data():
-    """Sample MCP server data for tests."""
-    return {
+@pytest.fixture(scope="session")
+def sample_mcp_data() -> Mapping:
+    """Sample MCP server data for tests (read-only; copy with dict() to change)."""
+    return MappingProxyType({
         "name": "Test MCP Server",
         "description": "A test MCP server",
         "connection_type": "stdio",
@@ -163,7 +168,41 @@ def sample_mcp_data():
         },
         "allowed_tools": [],
         "rejected_tools": [],
-    }
+    })
+
+
+@pytest.fixture
+def mcp_factory(client: TestClient, sample_mcp_data: Mapping):
+    """Seed MCP servers straight into the database.
+
+    ``mcp_factory(n, **overrides)`` inserts *n* servers built from
+    ``sample_mcp_data`` in one call on the app's event loop (no HTTP round
+    trip per server) and returns the stored rows, shaped like the
+    ``POST /api/mcp`` response.
+    """
+    async def _seed(items: list[dict]) -> list[dict]:
+        return [await _test_db.mcp_servers.put(item) for item in items]
+
+    def _make(n: int = 1, **overrides) -> list[dict]:
+        data = {**sample_mcp_data, **overrides}
+        config = data["config"]
+        if data["connection_type"] == "stdio":
+            endpoint = f"{config.get('command', '')} {' '.join(config.get('args', []))}"
+        else:
+            endpoint = config.get("url", "").replace("http://", "").replace("https://", "")
+        items = [
+            {**data, "endpoint": endpoint, "version": "v1.0.0"}
+            for _ in range(n)
+        ]
+        return client.portal.call(_seed, items)
+
+    return _make
+
+
+@pytest.fixture
+def created_mcp(mcp_factory) -> str:
+    """ID of one seeded MCP server (removed by the next database reset)."""
+    return mcp_factory(1)[0]["id"]
 
 
 @pytest.fixture
@@ -0,0 +1,111 @@
+"""Tests for channel API endpoints."""
+from typing import Generator
+
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+from schemas.channel import ChannelResponse, ChannelSessionResponse
+
+
+@pytest.fixture(scope="module")
+def channels_app() -> FastAPI:
+    """Minimal app with only the channels router and the API error handlers.
+
+    Skips the full app's lifespan, so the channel gateway never starts.
+    """
+    from middleware.error_handler import setup_error_handlers
+    from routers import channels_router
+
+    app = FastAPI()
+    setup_error_handlers(app)
+    app.include_router(channels_router, prefix="/api/channels", tags=["channels"])
+    return app
+
+
+@pytest.fixture(scope="module")
+def client(channels_app: FastAPI) -> Generator[TestClient, None, None]:
+    """One TestClient for the whole module."""
+    with TestClient(channels_app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def sample_channel_data() -> dict:
+    """Channel bound to the seeded default agent."""
+    return {
+        "name": "Test Feishu Channel",
+        "channel_type": "feishu",
+        "agent_id": "default",
+        "config": {"app_id": "cli_test", "app_secret": "secret"},
+        "allowed_senders": ["ou_1"],
+        "enable_skills": True,
+    }
+
+
+def _assert_channel_shape(data: dict) -> None:
+    """Check *data* has exactly the ChannelResponse fields, correctly typed."""
+    assert set(data) == set(ChannelResponse.model_fields)
+    assert ChannelResponse.model_validate(data).model_dump() == data
+    for field in ("enable_skills", "enable_mcp"):
+        assert isinstance(data[field], bool)
+    assert isinstance(data["rate_limit_per_minute"], int)
+    assert isinstance(data["config"], dict)
+    assert isinstance(data["allowed_senders"], list)
+    assert isinstance(data["blocked_senders"], list)
+
+
+class TestChannelResponseShape:
+    """Responses match the ChannelResponse schema."""
+
+    def test_create_get_and_list_shape(self, client: TestClient, sample_channel_data: dict):
+        """Create, get and list all return fully typed channel objects."""
+        response = client.post("/api/channels/", json=sample_channel_data)
+        assert response.status_code == status.HTTP_201_CREATED
+        created = response.json()
+        _assert_channel_shape(created)
+        assert created["agent_name"] == "Default Agent"
+        assert created["enable_skills"] is True
+        assert created["enable_mcp"] is False
+        assert created["allowed_senders"] == ["ou_1"]
+
+        response = client.get(f"/api/channels/{created['id']}")
+        assert response.status_code == status.HTTP_200_OK
+        fetched = response.json()
+        _assert_channel_shape(fetched)
+        assert fetched == created
+
+        response = client.get("/api/channels/")
+        assert response.status_code == status.HTTP_200_OK
+        listed = response.json()
+        assert [ch["id"] for ch in listed] == [created["id"]]
+        _assert_channel_shape(listed[0])
+
+    def test_get_channel_not_found(self, client: TestClient):
+        """Test getting an unknown channel returns 404."""
+        response = client.get("/api/channels/nonexistent-channel-id")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_list_sessions_shape(self, client: TestClient, sample_channel_data: dict):
+        """Session rows are returned with exactly the ChannelSessionResponse fields."""
+        from database import db
+
+        channel_id = client.post("/api/channels/", json=sample_channel_data).json()["id"]
+
+        async def _seed() -> None:
+            await db.channel_sessions.put({
+                "channel_id": channel_id,
+                "external_chat_id": "oc_chat",
+                "session_id": "session-1",
+                "agent_id": "default",
+                "message_count": 2,
+            })
+
+        client.portal.call(_seed)
+
+        response = client.get(f"/api/channels/{channel_id}/sessions")
+        assert response.status_code == status.HTTP_200_OK
+        sessions = response.json()
+        assert len(sessions) == 1
+        assert set(sessions[0]) == set(ChannelSessionResponse.model_fields)
+        assert sessions[0]["message_count"] == 2
@@ -0,0 +1,101 @@
+"""Tests for SQLite table helpers used by the channel gateway."""
+import pytest
+
+from database import db
+
+
+@pytest.fixture
+async def channel_session() -> dict:
+    """A channel session (with its channel and session) for the default agent."""
+    channel = await db.channels.put({
+        "name": "Test Channel",
+        "channel_type": "feishu",
+        "agent_id": "default",
+        "config": {},
+    })
+    session = await db.sessions.put({"agent_id": "default", "title": "Test"})
+    return await db.channel_sessions.put({
+        "channel_id": channel["id"],
+        "external_chat_id": "oc_chat",
+        "session_id": session["id"],
+        "agent_id": "default",
+    })
+
+
+class TestChannelMessagesPutMany:
+    """Tests for SQLiteChannelMessagesTable.put_many."""
+
+    async def test_put_many_inserts_all(self, channel_session: dict):
+        """All items are stored with generated ids and timestamps, in order.
+
+        The returned rows are copies; the caller's dicts are not modified.
+        """
+        items = [
+            {
+                "channel_session_id": channel_session["id"],
+                "direction": direction,
+                "content": content,
+            }
+            for direction, content in (("inbound", "hi"), ("outbound", "hello"))
+        ]
+        originals = [dict(item) for item in items]
+        stored = await db.channel_messages.put_many(items)
+
+        assert items == originals
+        assert [row["content"] for row in stored] == ["hi", "hello"]
+        assert all(row["id"] and row["created_at"] and row["updated_at"] for row in stored)
+        assert len({row["id"] for row in stored}) == 2
+
+        rows = await db.channel_messages.list_by_session(channel_session["id"])
+        assert [(r["direction"], r["content"]) for r in rows] == [
+            ("inbound", "hi"),
+            ("outbound", "hello"),
+        ]
+
+    async def test_put_many_keeps_given_id(self, channel_session: dict):
+        """An id supplied by the caller is used as-is."""
+        await db.channel_messages.put_many([{
+            "id": "msg-1",
+            "channel_session_id": channel_session["id"],
+            "direction": "inbound",
+            "content": "hi",
+        }])
+        row = await db.channel_messages.get("msg-1")
+        assert row is not None
+        assert row["content"] == "hi"
+
+    async def test_put_many_empty(self):
+        """An empty batch is a no-op."""
+        assert await db.channel_messages.put_many([]) == []
+
+
+class TestChannelSessionsIncrementMessageCount:
+    """Tests for SQLiteChannelSessionsTable.increment_message_count."""
+
+    async def test_increment_accumulates(self, channel_session: dict):
+        """Deltas add up and last_message_at takes the latest value."""
+        assert await db.channel_sessions.increment_message_count(
+            channel_session["id"], 2, "2026-01-01T12:00:00"
+        )
+        assert await db.channel_sessions.increment_message_count(
+            channel_session["id"], 1, "2026-01-01T12:05:00"
+        )
+
+        row = await db.channel_sessions.get(channel_session["id"])
+        assert row["message_count"] == 3
+        assert row["last_message_at"] == "2026-01-01T12:05:00"
+
+    async def test_increment_from_null_count(self, channel_session: dict):
+        """A NULL message_count is treated as zero."""
+        await db.channel_sessions.update(channel_session["id"], {"message_count": None})
+        await db.channel_sessions.increment_message_count(
+            channel_session["id"], 2, "2026-01-01T12:00:00"
+        )
+        row = await db.channel_sessions.get(channel_session["id"])
+        assert row["message_count"] == 2
+
+    async def test_increment_unknown_session(self):
+        """Returns False when no session matches."""
+        assert not await db.channel_sessions.increment_message_count(
+            "missing", 1, "2026-01-01T12:00:00"
+        )
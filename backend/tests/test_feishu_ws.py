@@ -0,0 +1,98 @@
+"""Guard tests for the Feishu adapter's use of lark SDK internals.
+
+``_FeishuWSClient`` mirrors the bodies of private ``lark.ws.Client``
+methods.  lark-oapi is pinned to an exact version in pyproject.toml; these
+tests fail when the installed SDK no longer matches what was mirrored, so
+an SDK bump cannot silently change the WS path.  After re-syncing the
+overrides with the new SDK, update the digests below.
+"""
+import hashlib
+import inspect
+
+import pytest
+
+lark = pytest.importorskip("lark_oapi")
+lark_ws = pytest.importorskip("lark_oapi.ws.client")
+
+# sha256 of inspect.getsource() for each mirrored method (lark-oapi 1.7.4)
+_MIRRORED_METHOD_DIGESTS = {
+    "start": "0c1ec672fd441c510251ca296938798db6c020cba90f95d76825f683075010fc",
+    "_connect": "b072786b5dd3ef9a130185d8f6a02019a2342145c387f9c6b42b1c8593f1adcc",
+    "_receive_message_loop": "3ccfd3f7a36a6a2946c7d354c079c4eae16235b29ea9f21c175df93b5f89fadd",
+}
+
+# Other SDK internals the overrides call into
+_CLIENT_METHODS_USED = (
+    "_get_conn_url", "_handle_message", "_disconnect", "_reconnect", "_ping_loop",
+)
+_MODULE_NAMES_USED = (
+    "websockets", "InvalidHandshake", "ClientException", "ConnectionClosedException",
+    "_parse_ws_conn_exception", "_ws_connect_kwargs", "DEVICE_ID", "SERVICE_ID",
+)
+
+
+@pytest.mark.parametrize("method", sorted(_MIRRORED_METHOD_DIGESTS))
+def test_mirrored_sdk_method_unchanged(method: str):
+    """The SDK method the adapter overrides still has the mirrored source."""
+    source = inspect.getsource(getattr(lark.ws.Client, method))
+    digest = hashlib.sha256(source.encode()).hexdigest()
+    assert digest == _MIRRORED_METHOD_DIGESTS[method], (
+        f"lark.ws.Client.{method} changed; re-sync _FeishuWSClient in "
+        "channels/adapters/feishu.py and update the digest"
+    )
+
+
+def test_sdk_internals_present():
+    """Every private SDK name the overrides rely on still exists."""
+    missing = [m for m in _CLIENT_METHODS_USED if not hasattr(lark.ws.Client, m)]
+    missing += [n for n in _MODULE_NAMES_USED if not hasattr(lark_ws, n)]
+    assert not missing
+
+
+def test_client_attributes_present():
+    """Instance state read and written by the overrides is set up by the SDK."""
+    client = lark.ws.Client("app_id", "app_secret")
+    for attr in ("_conn", "_conn_url", "_conn_id", "_service_id", "_lock", "_auto_reconnect"):
+        assert hasattr(client, attr), attr
+
+
+def test_rest_internals_present():
+    """Streamed attachment downloads read the REST client's config and token."""
+    from lark_oapi.core.token import TokenManager
+
+    client = lark.Client.builder().app_id("app_id").app_secret("app_secret").build()
+    assert client._config.domain
+    assert callable(TokenManager.get_self_tenant_token)
+
+
+class _FakeStream:
+    """Minimal streamed ``requests.Response`` for ``_read_capped``."""
+
+    def __init__(self, body: bytes, headers: dict) -> None:
+        self.body = body
+        self.headers = headers
+        self.chunks_read = 0
+
+    def iter_content(self, chunk_size: int):
+        for start in range(0, len(self.body), chunk_size):
+            self.chunks_read += 1
+            yield self.body[start:start + chunk_size]
+
+
+@pytest.mark.parametrize("declare_length", [True, False])
+def test_read_capped(monkeypatch, declare_length: bool):
+    """Bodies over the limit are rejected early; smaller ones are returned whole."""
+    from channels.adapters import feishu
+
+    monkeypatch.setattr(feishu, "MAX_ATTACHMENT_SIZE", 10)
+    monkeypatch.setattr(feishu, "_DOWNLOAD_CHUNK_SIZE", 4)
+
+    def stream(body: bytes) -> _FakeStream:
+        headers = {"Content-Length": str(len(body))} if declare_length else {}
+        return _FakeStream(body, headers)
+
+    assert feishu._read_capped(stream(b"x" * 10)) == b"x" * 10
+
+    oversized = stream(b"x" * 100)
+    assert feishu._read_capped(oversized) is None
+    assert oversized.chunks_read == (0 if declare_length else 3)
@@ -0,0 +1,95 @@
+"""Tests for the channel gateway's per-sender rate limiter."""
+from types import SimpleNamespace
+
+import pytest
+
+from channels import gateway
+from channels.gateway import _TokenBucketRateLimiter
+
+
+class _FakeClock:
+    """Stand-in for ``time.monotonic`` that only moves when told to."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> _FakeClock:
+    """Drive the gateway module's clock by hand (only its ``time`` reference)."""
+    fake = _FakeClock()
+    monkeypatch.setattr(gateway, "time", SimpleNamespace(monotonic=fake))
+    return fake
+
+
+class TestTokenBucketRateLimiter:
+    """Tests for _TokenBucketRateLimiter."""
+
+    def test_burst_up_to_limit(self, clock: _FakeClock):
+        """A new sender may send max_per_minute messages at once, then is limited."""
+        limiter = _TokenBucketRateLimiter()
+        assert all(limiter.is_allowed("alice", 5) for _ in range(5))
+        assert not limiter.is_allowed("alice", 5)
+        # Other senders have their own bucket
+        assert limiter.is_allowed("bob", 5)
+
+    def test_refill_over_time(self, clock: _FakeClock):
+        """Tokens come back at max_per_minute / 60 per second, capped at the limit."""
+        limiter = _TokenBucketRateLimiter()
+        for _ in range(6):
+            limiter.is_allowed("alice", 6)
+        assert not limiter.is_allowed("alice", 6)
+
+        clock.advance(5)  # half a token
+        assert not limiter.is_allowed("alice", 6)
+        clock.advance(5)  # one full token
+        assert limiter.is_allowed("alice", 6)
+        assert not limiter.is_allowed("alice", 6)
+
+        clock.advance(600)  # far more than a minute: refill caps at the limit
+        assert all(limiter.is_allowed("alice", 6) for _ in range(6))
+        assert not limiter.is_allowed("alice", 6)
+
+    def test_zero_limit_disables_limiting(self, clock: _FakeClock):
+        """A non-positive limit allows everything and keeps no state."""
+        limiter = _TokenBucketRateLimiter()
+        assert all(limiter.is_allowed("alice", 0) for _ in range(100))
+        assert not limiter._buckets
+
+    def test_evicts_least_recently_used_at_capacity(self, clock: _FakeClock):
+        """At max_senders, a new sender evicts the least recently used bucket."""
+        limiter = _TokenBucketRateLimiter(max_senders=2)
+        limiter.is_allowed("alice", 1)
+        limiter.is_allowed("bob", 1)
+        limiter.is_allowed("alice", 1)  # touches alice, so bob is now oldest
+        limiter.is_allowed("carol", 1)
+        assert list(limiter._buckets) == ["alice", "carol"]
+
+    def test_evicts_idle_buckets(self, clock: _FakeClock):
+        """Buckets idle for a minute (fully refilled) are dropped."""
+        limiter = _TokenBucketRateLimiter()
+        limiter.is_allowed("alice", 1)
+        clock.advance(30)
+        limiter.is_allowed("bob", 1)
+        clock.advance(30)
+        limiter.is_allowed("carol", 1)
+        assert list(limiter._buckets) == ["bob", "carol"]
+        # An evicted sender starts again with a full bucket
+        assert limiter.is_allowed("alice", 1)
+
+    def test_clear(self, clock: _FakeClock):
+        """clear() resets one sender, or all senders when none is given."""
+        limiter = _TokenBucketRateLimiter()
+        limiter.is_allowed("alice", 1)
+        limiter.is_allowed("bob", 1)
+        limiter.clear("alice")
+        assert limiter.is_allowed("alice", 1)
+        assert not limiter.is_allowed("bob", 1)
+        limiter.clear()
+        assert not limiter._buckets
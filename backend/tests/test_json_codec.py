@@ -0,0 +1,22 @@
+"""Tests for the shared JSON helpers."""
+import json
+
+import pytest
+
+from core.json_codec import json_dumps_bytes, json_loads
+
+
+@pytest.mark.parametrize("obj", [
+    {"type": "text", "content": "héllo", "items": [1, 2.5, None, True]},
+    {1: "int key", "nested": {2: [3]}},
+    {"big": 2 ** 70},
+])
+def test_dumps_round_trips(obj):
+    """Everything json.dumps accepts encodes, including what orjson rejects."""
+    assert json_loads(json_dumps_bytes(obj)) == json.loads(json.dumps(obj))
+
+
+def test_dumps_unserializable_raises():
+    """Objects neither encoder supports still raise TypeError."""
+    with pytest.raises(TypeError):
+        json_dumps_bytes({"value": object()})
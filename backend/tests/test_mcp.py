@@ -1,6 +1,51 @@
 """Tests for MCP server API endpoints."""
+import asyncio
+from typing import AsyncGenerator, Generator, Mapping
+
 import pytest
+from fastapi import FastAPI, status
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
+
+# Status codes the API may use for a rejected MCP server configuration
+_VALIDATION_ERROR_STATUSES = (
+    status.HTTP_400_BAD_REQUEST,
+    status.HTTP_422_UNPROCESSABLE_CONTENT,
+)
+
+
+@pytest.fixture(scope="module")
+def mcp_app() -> FastAPI:
+    """Minimal app with only the MCP router and the API error handlers.
+
+    Skips the full app's lifespan (channel gateway, SDK clients) and
+    middleware; the autouse database reset initializes the schema.
+    """
+    from middleware.error_handler import setup_error_handlers
+    from routers import mcp_router
+
+    app = FastAPI()
+    setup_error_handlers(app)
+    app.include_router(mcp_router, prefix="/api/mcp", tags=["mcp"])
+    return app
+
+
+@pytest.fixture(scope="module")
+def client(mcp_app: FastAPI) -> Generator[TestClient, None, None]:
+    """One TestClient for the whole module.
+
+    Per-test isolation still comes from the autouse database reset.
+    """
+    with TestClient(mcp_app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+async def async_client(mcp_app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
+    """Async client for the MCP-only app."""
+    transport = ASGITransport(app=mcp_app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
 
 
 class TestMCPList:
@@ -9,175 +54,115 @@ class TestMCPList:
     def test_list_mcp_servers_success(self, client: TestClient):
         """Test listing MCP servers returns 200 and list."""
         response = client.get("/api/mcp")
-        assert response.status_code == 200
+        assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert isinstance(data, list)
 
 
-class TestGetMCP:
-    """Tests for GET /api/mcp/{mcp_id} endpoint."""
-
-    def test_get_mcp_server_success(self, client: TestClient, sample_mcp_data: dict):
-        """Test getting an existing MCP server returns 200."""
-        # First create a server
-        create_response = client.post("/api/mcp", json=sample_mcp_data)
-        assert create_response.status_code == 201
-        mcp_id = create_response.json()["id"]
-
-        # Now get it
-        response = client.get(f"/api/mcp/{mcp_id}")
-        assert response.status_code == 200
-        data = response.json()
-        assert data["id"] == mcp_id
-        assert data["name"] == sample_mcp_data["name"]
-
-    def test_get_mcp_server_not_found(self, client: TestClient, invalid_mcp_id: str):
-        """Test getting non-existent MCP server returns 404."""
-        response = client.get(f"/api/mcp/{invalid_mcp_id}")
-        assert response.status_code == 404
-        data = response.json()
-        assert data["code"] == "MCP_SERVER_NOT_FOUND"
-        assert "suggested_action" in data
-
-
 class TestCreateMCP:
     """Tests for POST /api/mcp endpoint."""
 
-    def test_create_mcp_stdio_success(self, client: TestClient, sample_mcp_data: dict):
-        """Test creating stdio MCP server returns 201."""
-        response = client.post("/api/mcp", json=sample_mcp_data)
-        assert response.status_code == 201
-        data = response.json()
-        assert data["name"] == sample_mcp_data["name"]
-        assert data["connection_type"] == "stdio"
-        assert "id" in data
-        assert "endpoint" in data
-
-    def test_create_mcp_sse_success(self, client: TestClient):
-        """Test creating SSE MCP server returns 201."""
+    @pytest.mark.parametrize("connection_type,config", [
+        ("stdio", {"command": "npx", "args": ["-y", "@modelcontextprotocol/server-test"]}),
+        ("sse", {"url": "http://localhost:8080/sse"}),
+        ("http", {"url": "http://localhost:9000"}),
+    ])
+    def test_create_mcp_success(self, client: TestClient, connection_type: str, config: dict):
+        """Test creating stdio/SSE/HTTP MCP servers returns 201."""
         mcp_data = {
-            "name": "SSE MCP Server",
-            "connection_type": "sse",
-            "config": {"url": "http://localhost:8080/sse"}
+            "name": f"{connection_type.upper()} MCP Server",
+            "connection_type": connection_type,
+            "config": config,
         }
         response = client.post("/api/mcp", json=mcp_data)
-        assert response.status_code == 201
+        assert response.status_code == status.HTTP_201_CREATED
         data = response.json()
-        assert data["connection_type"] == "sse"
+        assert data["name"] == mcp_data["name"]
+        assert data["connection_type"] == connection_type
+        assert "id" in data
+        assert "endpoint" in data
 
-    def test_create_mcp_http_success(self, client: TestClient):
-        """Test creating HTTP MCP server returns 201."""
-        mcp_data = {
-            "name": "HTTP MCP Server",
-            "connection_type": "http",
-            "config": {"url": "http://localhost:9000"}
-        }
-        response = client.post("/api/mcp", json=mcp_data)
-        assert response.status_code == 201
-        data = response.json()
-        assert data["connection_type"] == "http"
+    async def test_create_mcp_missing_connection_config(self, async_client: AsyncClient):
+        """Test creating stdio without command / SSE without URL returns errors."""
+        stdio_response, sse_response = await asyncio.gather(
+            async_client.post("/api/mcp", json={
+                "name": "Invalid MCP",
+                "connection_type": "stdio",
+                "config": {}  # Missing command
+            }),
+            async_client.post("/api/mcp", json={
+                "name": "Invalid MCP",
+                "connection_type": "sse",
+                "config": {}  # Missing url
+            }),
+        )
+        for response in (stdio_response, sse_response):
+            assert response.status_code in _VALIDATION_ERROR_STATUSES
+            data = response.json()
+            assert "code" in data
 
-    def test_create_mcp_stdio_missing_command(self, client: TestClient):
-        """Test creating stdio MCP without command returns error."""
-        mcp_data = {
-            "name": "Invalid MCP",
-            "connection_type": "stdio",
-            "config": {}  # Missing command
-        }
-        response = client.post("/api/mcp", json=mcp_data)
-        assert response.status_code in [400, 422]
-        data = response.json()
-        assert "code" in data
 
-    def test_create_mcp_sse_missing_url(self, client: TestClient):
-        """Test creating SSE MCP without URL returns error."""
-        mcp_data = {
-            "name": "Invalid MCP",
-            "connection_type": "sse",
-            "config": {}  # Missing url
-        }
-        response = client.post("/api/mcp", json=mcp_data)
-        assert response.status_code in [400, 422]
-        data = response.json()
-        assert "code" in data
+class TestMCPNotFound:
+    """Tests for GET/PUT/DELETE /api/mcp/{mcp_id} with an unknown ID."""
+
+    async def test_mcp_not_found(self, async_client: AsyncClient, invalid_mcp_id: str):
+        """Test get, update and delete of a non-existent server return 404."""
+        get_response, update_response, delete_response = await asyncio.gather(
+            async_client.get(f"/api/mcp/{invalid_mcp_id}"),
+            async_client.put(f"/api/mcp/{invalid_mcp_id}", json={"name": "New Name"}),
+            async_client.delete(f"/api/mcp/{invalid_mcp_id}"),
+        )
+        for response in (get_response, update_response, delete_response):
+            assert response.status_code == status.HTTP_404_NOT_FOUND
+            data = response.json()
+            assert data["code"] == "MCP_SERVER_NOT_FOUND"
+            assert "suggested_action" in data
 
 
-class TestUpdateMCP:
-    """Tests for PUT /api/mcp/{mcp_id} endpoint."""
+class TestMCPLifecycle:
+    """Tests for the create → read → update → delete cycle."""
 
-    def test_update_mcp_success(self, client: TestClient, sample_mcp_data: dict):
-        """Test updating MCP server returns 200."""
-        # Create server
-        create_response = client.post("/api/mcp", json=sample_mcp_data)
-        mcp_id = create_response.json()["id"]
+    def test_mcp_crud_lifecycle(self, client: TestClient, sample_mcp_data: Mapping):
+        """Test a server can be created, read, updated, listed and deleted."""
+        create_response = client.post("/api/mcp", json=dict(sample_mcp_data))
+        assert create_response.status_code == status.HTTP_201_CREATED
+        created = create_response.json()
+        mcp_id = created["id"]
+        assert created["name"] == sample_mcp_data["name"]
 
-        # Update it
-        response = client.put(
+        get_response = client.get(f"/api/mcp/{mcp_id}")
+        assert get_response.status_code == status.HTTP_200_OK
+        assert get_response.json() == created
+
+        update_response = client.put(
             f"/api/mcp/{mcp_id}",
             json={"name": "Updated Server Name"}
         )
-        assert response.status_code == 200
-        data = response.json()
-        assert data["name"] == "Updated Server Name"
+        assert update_response.status_code == status.HTTP_200_OK
+        assert update_response.json()["name"] == "Updated Server Name"
 
-    def test_update_mcp_not_found(self, client: TestClient, invalid_mcp_id: str):
-        """Test updating non-existent MCP server returns 404."""
-        response = client.put(
-            f"/api/mcp/{invalid_mcp_id}",
-            json={"name": "New Name"}
-        )
-        assert response.status_code == 404
-        data = response.json()
-        assert data["code"] == "MCP_SERVER_NOT_FOUND"
-
-
-class TestDeleteMCP:
-    """Tests for DELETE /api/mcp/{mcp_id} endpoint."""
-
-    def test_delete_mcp_success(self, client: TestClient, sample_mcp_data: dict):
-        """Test deleting MCP server returns 204."""
-        # Create server
-        create_response = client.post("/api/mcp", json=sample_mcp_data)
-        mcp_id = create_response.json()["id"]
+        list_response = client.get("/api/mcp")
+        assert list_response.status_code == status.HTTP_200_OK
+        ids = {s["id"] for s in list_response.json()}
+        assert mcp_id in ids
 
-        # Delete it
-        response = client.delete(f"/api/mcp/{mcp_id}")
-        assert response.status_code == 204
+        delete_response = client.delete(f"/api/mcp/{mcp_id}")
+        assert delete_response.status_code == status.HTTP_204_NO_CONTENT
 
         # Verify it's gone
-        get_response = client.get(f"/api/mcp/{mcp_id}")
-        assert get_response.status_code == 404
-
-    def test_delete_mcp_not_found(self, client: TestClient, invalid_mcp_id: str):
-        """Test deleting non-existent MCP server returns 404."""
-        response = client.delete(f"/api/mcp/{invalid_mcp_id}")
-        assert response.status_code == 404
-        data = response.json()
-        assert data["code"] == "MCP_SERVER_NOT_FOUND"
+        assert client.get(f"/api/mcp/{mcp_id}").status_code == status.HTTP_404_NOT_FOUND
 
 
 class TestMCPReadAfterCreate:
     """Tests for verifying MCP server persists after creation."""
 
-    def test_created_mcp_appears_in_list(self, client: TestClient, sample_mcp_data: dict):
-        """Test that a created MCP server appears in the list."""
-        create_response = client.post("/api/mcp", json=sample_mcp_data)
-        assert create_response.status_code == 201
-        mcp_id = create_response.json()["id"]
-
-        # Verify it appears in the list
+    def test_list_reflects_create_and_delete(self, client: TestClient, created_mcp: str):
+        """Test that the list shows a server while it exists and drops it after delete."""
         list_response = client.get("/api/mcp")
-        assert list_response.status_code == 200
-        ids = [s["id"] for s in list_response.json()]
-        assert mcp_id in ids
-
-    def test_deleted_mcp_not_in_list(self, client: TestClient, sample_mcp_data: dict):
-        """Test that a deleted MCP server no longer appears."""
-        create_response = client.post("/api/mcp", json=sample_mcp_data)
-        mcp_id = create_response.json()["id"]
+        assert list_response.status_code == status.HTTP_200_OK
+        assert created_mcp in {s["id"] for s in list_response.json()}
 
-        client.delete(f"/api/mcp/{mcp_id}")
+        client.delete(f"/api/mcp/{created_mcp}")
 
         list_response = client.get("/api/mcp")
-        ids = [s["id"] for s in list_response.json()]
-        assert mcp_id not in ids
+        assert created_mcp not in {s["id"] for s in list_response.json()}
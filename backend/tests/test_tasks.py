@@ -0,0 +1,88 @@
+"""Tests for task API endpoints."""
+from datetime import datetime, timedelta
+from typing import Generator
+
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="module")
+def tasks_app() -> FastAPI:
+    """Minimal app with only the tasks router and the API error handlers."""
+    from middleware.error_handler import setup_error_handlers
+    from routers import tasks_router
+
+    app = FastAPI()
+    setup_error_handlers(app)
+    app.include_router(tasks_router, prefix="/api/tasks", tags=["tasks"])
+    return app
+
+
+@pytest.fixture(scope="module")
+def client(tasks_app: FastAPI) -> Generator[TestClient, None, None]:
+    """One TestClient for the whole module."""
+    with TestClient(tasks_app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def seeded_task_ids(client: TestClient) -> list[str]:
+    """Seed five tasks a minute apart; returns their IDs newest first."""
+    from database import db
+
+    base = datetime(2026, 1, 1, 12, 0, 0)
+    tasks = [
+        {
+            "id": f"task-{i}",
+            "agent_id": "default",
+            "status": "completed" if i % 2 else "failed",
+            "title": f"Task {i}",
+            "created_at": (base + timedelta(minutes=i)).isoformat(),
+        }
+        for i in range(5)
+    ]
+
+    async def _seed() -> None:
+        for task in tasks:
+            await db.tasks.put(task)
+
+    client.portal.call(_seed)
+    return [task["id"] for task in reversed(tasks)]
+
+
+class TestTaskListPaging:
+    """Tests for GET /api/tasks ordering and limit/offset paging."""
+
+    def test_list_newest_first(self, client: TestClient, seeded_task_ids: list[str]):
+        """Without a limit every task is returned, newest first."""
+        response = client.get("/api/tasks")
+        assert response.status_code == status.HTTP_200_OK
+        assert [t["id"] for t in response.json()] == seeded_task_ids
+
+    @pytest.mark.parametrize("limit,offset", [(2, 0), (2, 2), (2, 4), (5, 0), (3, 10)])
+    def test_list_pages(
+        self, client: TestClient, seeded_task_ids: list[str], limit: int, offset: int
+    ):
+        """Each page is the matching slice of the newest-first list."""
+        response = client.get("/api/tasks", params={"limit": limit, "offset": offset})
+        assert response.status_code == status.HTTP_200_OK
+        assert [t["id"] for t in response.json()] == seeded_task_ids[offset:offset + limit]
+
+    def test_list_pages_with_status_filter(self, client: TestClient, seeded_task_ids: list[str]):
+        """Paging applies after the status filter."""
+        response = client.get(
+            "/api/tasks", params={"status": "failed", "limit": 2, "offset": 1}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [t["id"] for t in response.json()] == ["task-2", "task-0"]
+
+    @pytest.mark.parametrize("params", [
+        {"limit": 0},
+        {"limit": 501},
+        {"limit": 10, "offset": -1},
+    ])
+    def test_list_rejects_out_of_range_paging(self, client: TestClient, params: dict):
+        """limit must be within 1-500 and offset non-negative."""
+        response = client.get("/api/tasks", params=params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -142,9 +142,15 @@ def main():
         server = uvicorn.Server(config)
         write_startup_log("Uvicorn server instance created")
 
-        # Run the server
+        # Run the server on uvloop where it is installed (not on Windows)
+        try:
+            import uvloop
+            run = uvloop.run
+            write_startup_log("Using uvloop event loop")
+        except ImportError:
+            run = asyncio.run
         write_startup_log("Starting uvicorn server.serve()...")
-        asyncio.run(server.serve())
+        run(server.serve())
         write_startup_log("Server stopped normally")
     except Exception as e:
         error_msg = f"Server error: {type(e).__name__}: {e}\n{traceback.format_exc()}"
@@ -235,6 +241,7 @@ hiddenimports += collect_submodules('pydantic_settings')
 hiddenimports += collect_submodules('anyio')
 hiddenimports += collect_submodules('slowapi')
 hiddenimports += collect_submodules('claude_agent_sdk')
+hiddenimports += collect_submodules('uvloop')  # empty where uvloop is not installed
 
 # Collect data files (including bundled CLI binary from claude_agent_sdk)
 datas = []